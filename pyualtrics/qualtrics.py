@@ -4,57 +4,1272 @@
 # TODO: Exceptions for 401 Unauthorized API responses
 
 
+import asyncio
+import collections
+import collections.abc
+import contextlib
 import csv
+import functools
+import hashlib
 import io
+import json
+import re
+import threading
+import weakref
 import zipfile
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
+from email.utils import parsedate_to_datetime
 import pandas as pd
 import requests
 import time
 import logging
+import os
+try:
+    import httpx
+except ImportError:  # only needed for AsyncQualtrics
+    httpx = None
+try:
+    import pyarrow.feather
+    import pyarrow.parquet
+except ImportError:  # only needed for ResponseStore
+    pyarrow = None
+import random
+import shutil
+import sqlite3
+import tempfile
 
 logging.basicConfig(format='%(levelname)s:%(message)s', level=logging.INFO)
 
 
 
-header: str = ""
-verboseRequests: bool = False
+def _parse_dates(values: pd.Series):
+    # one vectorized parse per column; timezone-aware values (JSON exports) are compared as naive UTC
+    dates = pd.to_datetime(values.replace('', None), errors='coerce')
+    if getattr(dates.dt, 'tz', None) is not None:
+        dates = dates.dt.tz_convert(None)
+    return dates
 
 
-def _compare_timestamps(stamp1, stamp2, beforeAfter=None):
-    if not beforeAfter or beforeAfter.lower()[0] not in ['b', 'a']:
+def _timestamp(value):
+    stamp = pd.Timestamp(value)
+    if stamp.tzinfo is not None:
+        stamp = stamp.tz_convert(None)
+    return stamp
+
+
+def _date_mask(dates: pd.Series, stamp, beforeAfter):
+    if not beforeAfter or str(beforeAfter).lower()[0] not in ['b', 'a']:
         raise Exception("before/after not specified")
-    stamp1 = datetime.strptime(stamp1, "%Y-%m-%d %H:%M:%S")
-    stamp2 = datetime.strptime(stamp2, "%Y-%m-%d %H:%M:%S")
-    if beforeAfter == 'b':
-        return stamp1 > stamp2
-    if beforeAfter == 'a':
-        return stamp1 < stamp2
-    return None
+    if str(beforeAfter).lower().startswith('b'):
+        return dates < _timestamp(stamp)
+    return dates > _timestamp(stamp)
+
+
+BOOLEAN_TEXT = {'true': True, '1': True, 'false': False, '0': False}
+
+
+def _text_mask(values: pd.Series, wanted):
+    # exact match on the exported value, so 1 and '1' both match a CSV cell of '1'. Typed columns (ResponseStore,
+    # typed chunks) are compared by value, so '1' also matches 1.0 and Finished == True, as it would in the CSV
+    wanted = list(wanted)
+    missing = values.isna() if any(value is None or value == '' for value in wanted) else False
+    if pd.api.types.is_bool_dtype(values):
+        flags = {BOOLEAN_TEXT.get(str(value).lower()) for value in wanted} - {None}
+        return values.isin(flags).fillna(False).astype(bool) | missing
+    if pd.api.types.is_numeric_dtype(values):
+        numbers = pd.to_numeric(pd.Series(wanted, dtype=object), errors='coerce').dropna()
+        return values.isin(set(numbers)) | missing
+    # empty CSV cells are missing too, so None matches them as it matches NaN in a typed column
+    texts = values.astype(object).where(values.notna(), '').astype(str)
+    if missing is not False:
+        missing = texts == ''
+    return texts.isin({str(value) for value in wanted if value is not None}) | missing
+
+
+class ExportError(Exception):
+    def __init__(self, message, progressId: str = None):
+        super().__init__(message)
+        self.progressId = progressId
+
+
+class ExportFailed(ExportError):
+    pass
+
+
+class ExportTimeout(ExportError):
+    pass
+
+
+class ExportCancelled(ExportError):
+    pass
+
+
+# Requests per minute allowed by Qualtrics for specific endpoints (method, path pattern relative to the base URL)
+# Everything else only counts against the brand-wide limit
+DEFAULT_RATE_LIMITS = {
+    'start_response_export': ('POST', r'/surveys/[^/]+/export-responses/?$', 100),
+    'get_response_export_progress': ('GET', r'/surveys/[^/]+/export-responses/[^/]+$', 1000),
+    'get_response_export_file': ('GET', r'/surveys/[^/]+/export-responses/[^/]+/file$', 100),
+    'list_surveys': ('GET', r'/surveys/?$', 3000),
+    'get_survey_definition': ('GET', r'/survey-definitions/[^/]+', 3000),
+    'list_mailing_lists': ('GET', r'/mailinglists/?$', 3000),
+    'list_contacts': ('GET', r'/mailinglists/[^/]+/contacts/?$', 3000),
+    'create_contact': ('POST', r'/mailinglists/[^/]+/contacts/?$', 3000),
+    'update_response': ('PUT', r'/responses/[^/]+$', 3000),
+    'delete_response': ('DELETE', r'/surveys/[^/]+/responses/[^/]+', 3000),
+}
+BRAND_RATE_LIMIT = 3000
+
+
+class TokenBucket:
+    def __init__(self, perMinute: float, burst: int = None):
+        """
+        Thread-safe token bucket that refills at perMinute / 60 tokens per second
+
+        :param perMinute: Sustained number of requests allowed per minute
+        :param burst: Maximum number of tokens that can be saved up. Defaults to one second's worth (at least 1)
+        """
+        self.rate = perMinute / 60.0
+        self.capacity = burst if burst else max(1, int(self.rate))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _reserve(self):
+        # take a token now (possibly going into debt) and return how long the caller has to wait for it
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0
+            return -self.tokens / self.rate
+
+    def acquire(self):
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+
+class RateLimiter:
+    def __init__(self, limits: dict = None, brandLimit: float = BRAND_RATE_LIMIT):
+        """
+        Keeps API calls under Qualtrics' per-endpoint and brand-wide quotas
+
+        :param limits: {'name': (method, path regex, requests per minute)}. Defaults to DEFAULT_RATE_LIMITS
+        :param brandLimit: Requests per minute allowed across all endpoints. None to disable
+        """
+        if limits is None:
+            limits = DEFAULT_RATE_LIMITS
+        self.endpoints = []
+        for name, (method, pattern, perMinute) in limits.items():
+            self.endpoints.append((method.upper(), re.compile(pattern), TokenBucket(perMinute)))
+        self.brandBucket = TokenBucket(brandLimit) if brandLimit else None
+        self.blockedUntil = 0
+        self.lock = threading.Lock()
+
+    def acquire(self, method: str, path: str):
+        """
+        Block until a request to this endpoint is allowed
+        :param method: HTTP method
+        :param path: URL path, relative to the base URL
+        """
+        wait = self.blockedUntil - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        for bucket in self._buckets(method, path):
+            bucket.acquire()
+
+    async def acquire_async(self, method: str, path: str):
+        """
+        Wait, without blocking the event loop, until a request to this endpoint is allowed
+        :param method: HTTP method
+        :param path: URL path, relative to the base URL
+        """
+        wait = self.blockedUntil - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        for bucket in self._buckets(method, path):
+            wait = bucket._reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+    def _buckets(self, method: str, path: str):
+        buckets = []
+        for endpointMethod, pattern, bucket in self.endpoints:
+            if endpointMethod == method.upper() and pattern.search(path):
+                buckets.append(bucket)
+                break
+        if self.brandBucket:
+            buckets.append(self.brandBucket)
+        return buckets
+
+    def back_off(self, seconds: float):
+        """
+        Pause every request sharing this limiter, i.e. after a 429 Too Many Requests
+        :param seconds: How long to pause
+        """
+        with self.lock:
+            self.blockedUntil = max(self.blockedUntil, time.monotonic() + seconds)
+
+
+def _retry_after_seconds(res, default: float):
+    retryAfter = res.headers.get('Retry-After')
+    if not retryAfter:
+        return default
+    try:
+        return max(0.0, float(retryAfter))
+    except ValueError:
+        pass
+    try:
+        retryAt = parsedate_to_datetime(retryAfter)
+    except (TypeError, ValueError):
+        return default
+    return max(0.0, (retryAt - datetime.now(tz=retryAt.tzinfo)).total_seconds())
+
+
+def _backoff_delays(initial: float = 0.5, maximum: float = 10, factor: float = 2, jitter: float = 0):
+    # jitter spreads each delay by +/- that fraction so concurrent pollers don't hit the API in lockstep
+    delay = initial
+    while True:
+        if jitter:
+            yield min(maximum, random.uniform(delay * (1 - jitter), delay * (1 + jitter)))
+        else:
+            yield delay
+        delay = min(maximum, delay * factor)
+
+
+def _poll_job(transport, url, description: str, pollInterval: float = 0.5, maxPollInterval: float = 10,
+              timeout: float = None):
+    """
+    Poll a bulk job (contact import, response update) until it leaves inProgress
+    :return: (status, last result). status is 'timedOut' if the job was still running after timeout seconds
+    """
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    result = {}
+    for delay in _backoff_delays(initial=pollInterval, maximum=maxPollInterval):
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return 'timedOut', result
+            delay = min(delay, remaining)
+        time.sleep(delay)
+        try:
+            res = transport.get_request(url=url, cache=False)
+        except requests.RequestException as e:  # transient, keep polling until the deadline
+            logging.warning("Checking on {} failed: {}".format(description, e))
+            continue
+        if not res:
+            continue
+        result = res.json()['result']
+        status = result.get('status', 'complete' if result.get('percentComplete') == 100 else 'inProgress')
+        if transport.verbose:
+            logging.info("{} is {}% complete".format(description, result.get('percentComplete')))
+        if status not in ['inProgress', 'queued']:
+            return status, result
+
+
+async def _run_in_thread(func, *args, **kwargs):
+    # asyncio.to_thread needs Python 3.9
+    return await asyncio.get_event_loop().run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+
+def _with_offset(url, offset):
+    return '{}{}offset={}'.format(url, '&' if '?' in url else '?', offset)
+
+
+# Qualtrics object ids look like SV_abc123, UR_abc123, ML_abc123, ...
+QUALTRICS_ID = re.compile(r'^[A-Z]{1,4}_[A-Za-z0-9]+$')
+
+
+class HTTPCache:
+    def __init__(self, ttl: float = 60, maxBytes: int = 64 * 1024 * 1024):
+        """
+        In-memory cache of GET responses, keyed by URL and API token. Entries are served as-is for ttl seconds,
+        then revalidated with If-None-Match/If-Modified-Since when the API sent an ETag/Last-Modified, so an
+        unchanged resource comes back as a bodiless 304. Least recently used entries are evicted past maxBytes
+
+        :param ttl: Seconds an entry is used without asking the API. 0 revalidates every time
+        :param maxBytes: Total size of the cached bodies
+        """
+        self.ttl = ttl
+        self.maxBytes = maxBytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, res: requests.Response):
+        entry = {'content': res.content, 'status': res.status_code, 'headers': dict(res.headers),
+                 'url': res.url, 'encoding': res.encoding, 'reason': res.reason, 'storedAt': time.monotonic()}
+        if len(entry['content']) > self.maxBytes:
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = entry
+            self.size += len(entry['content'])
+            while self.size > self.maxBytes:
+                self._remove(next(iter(self._entries)))
+
+    def touch(self, key):
+        # a 304 confirmed the entry, start its ttl over
+        with self._lock:
+            if key in self._entries:
+                self._entries[key]['storedAt'] = time.monotonic()
+
+    def is_fresh(self, entry):
+        return time.monotonic() - entry['storedAt'] < self.ttl
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= len(entry['content'])
+
+    def invalidate(self, url, token):
+        """
+        Drop what a POST/PUT/DELETE to url may have changed: anything about the objects it names, and the list it
+        belongs to
+        :param url: URL that was changed
+        :param token: API token the change was made with
+        """
+        path = requests.utils.urlparse(url).path.rstrip('/')
+        segments = path.split('/')
+        ids = [segment for segment in segments if QUALTRICS_ID.match(segment)]
+        while segments and QUALTRICS_ID.match(segments[-1]):
+            segments.pop()
+        collection = '/'.join(segments)
+        with self._lock:
+            for key in list(self._entries):
+                cachedUrl, cachedToken = key[0], key[1]
+                if cachedToken != token:
+                    continue
+                cachedPath = requests.utils.urlparse(cachedUrl).path.rstrip('/')
+                if cachedPath == collection or any(id in cachedPath.split('/') for id in ids):
+                    self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    @staticmethod
+    def response(entry):
+        # a fresh requests.Response per caller, so nobody shares (or closes) another caller's object
+        res = requests.Response()
+        res._content = entry['content']
+        res._content_consumed = True
+        res.status_code = entry['status']
+        res.headers = requests.structures.CaseInsensitiveDict(entry['headers'])
+        res.url = entry['url']
+        res.encoding = entry['encoding']
+        res.reason = entry['reason']
+        return res
+
+
+class Transport:
+    def __init__(self, token: str, poolSize: int = 10, keepAlive: bool = True, timeout: float = 60,
+                 verbose: bool = False, rateLimiter: RateLimiter = None, maxRetries: int = 5,
+                 cache: HTTPCache = None):
+        """
+        Per-client HTTP transport. Holds a pooled requests.Session so connections are reused across API calls
+
+        :param token: Qualtrics API key sent with every request
+        :param poolSize: Maximum number of connections kept open to the Qualtrics host
+        :param keepAlive: Reuse connections between requests. False closes the connection after every call
+        :param timeout: Seconds to wait for the server (float, or (connect, read) tuple). None waits forever
+        :param verbose: Log every request
+        :param rateLimiter: Throttle requests through this RateLimiter. None disables throttling
+        :param maxRetries: How many times to retry a request rejected with 429 Too Many Requests
+        :param cache: Serve repeated GETs from this HTTPCache. None disables caching
+        """
+        self.token = token
+        self.cache = cache
+        self.rateLimiter = rateLimiter
+        self.maxRetries = maxRetries
+        self.header = {'X-API-TOKEN': self.token}
+        self.timeout = timeout
+        self.verbose = verbose
+        self.session = requests.Session()
+        self.session.headers.update(self.header)
+        if not keepAlive:
+            self.session.headers['Connection'] = 'close'
+        adapter = requests.adapters.HTTPAdapter(pool_connections=poolSize, pool_maxsize=poolSize)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def _request(self, method, url, request_header=None, **kwargs):
+        path = requests.utils.urlparse(url).path
+        attempt = 0
+        while True:
+            if self.rateLimiter:
+                self.rateLimiter.acquire(method, path)
+            if self.verbose:
+                logging.info("{} {}".format(method, url))
+            res = self.session.request(method, url, headers=request_header, timeout=self.timeout, **kwargs)
+            if res.status_code != 429 or attempt >= self.maxRetries:
+                return res
+            delay = _retry_after_seconds(res, default=2 ** attempt)
+            if self.verbose:
+                logging.info("Rate limited, retrying in {:.1f}s".format(delay))
+            res.close()
+            if self.rateLimiter:
+                self.rateLimiter.back_off(delay)
+            else:
+                time.sleep(delay)
+            attempt += 1
+
+    def get_request(self, url, request_header=None, payload: dict = None, stream: bool = False, cache: bool = True):
+        # cache=False for anything polled (export, import and job progress), which must never be served stale
+        if self.cache is None or not cache or stream or payload:
+            return self._request('GET', url, request_header=request_header, data=payload, stream=stream)
+        key = (url, self.token, tuple(sorted((request_header or {}).items())))
+        entry = self.cache.get(key)
+        if entry is not None and self.cache.is_fresh(entry):
+            self.cache.hits += 1
+            return self.cache.response(entry)
+        conditionalHeader = dict(request_header or {})
+        if entry is not None:
+            if entry['headers'].get('ETag'):
+                conditionalHeader['If-None-Match'] = entry['headers']['ETag']
+            if entry['headers'].get('Last-Modified'):
+                conditionalHeader['If-Modified-Since'] = entry['headers']['Last-Modified']
+        res = self._request('GET', url, request_header=conditionalHeader or None)
+        if res.status_code == 304 and entry is not None:
+            self.cache.revalidations += 1
+            self.cache.touch(key)
+            return self.cache.response(entry)
+        self.cache.misses += 1
+        if res.status_code == 200:
+            self.cache.put(key, res)
+        return res
+
+    def _mutate(self, method, url, **kwargs):
+        res = self._request(method, url, **kwargs)
+        if self.cache is not None:
+            self.cache.invalidate(url, self.token)
+        return res
+
+    def post_request(self, url, request_header=None, payload: dict = None):
+        return self._mutate('POST', url, request_header=request_header, json=payload)
+
+    def put_request(self, url, request_header=None, payload: dict = None):
+        return self._mutate('PUT', url, request_header=request_header, json=payload)
+
+    def delete_request(self, url, request_header=None):
+        return self._mutate('DELETE', url, request_header=request_header)
+
+    def iter_elements(self, url, offsetPaging: bool = False, prefetch: int = 0, failures: list = None):
+        """
+        Yield the elements of a paginated list endpoint, one page in memory at a time
+        :param url: URL of the first page
+        :param offsetPaging: Build the next page URL with ?offset= rather than following the returned 'nextPage'
+        :param prefetch: With offsetPaging, keep up to this many upcoming pages downloading on a thread pool
+        :param failures: The response of a page that couldn't be fetched is appended here, the elements stop
+            there. Optional
+        :return: generator of element dicts
+        """
+        if failures is None:
+            failures = []
+        if prefetch > 0 and offsetPaging:
+            yield from self._iter_elements_prefetched(url=url, prefetch=prefetch, failures=failures)
+            return
+        firstUrl = url
+        offset = 0
+        while url:
+            res = self.get_request(url=url)
+            if not res:
+                failures.append(res)
+                return
+            result = res.json()['result']
+            elements = result['elements']
+            for element in elements:
+                yield element
+            if not result.get('nextPage') or not elements:
+                return
+            if offsetPaging:
+                offset += len(elements)
+                url = _with_offset(firstUrl, offset)
+            else:
+                url = result.get('nextPage')
+
+    def _iter_elements_prefetched(self, url, prefetch: int, failures: list):
+        # first page has to be fetched on its own to learn the page size, after that offsets are known in advance
+        res = self.get_request(url=url)
+        if not res:
+            failures.append(res)
+            return
+        result = res.json()['result']
+        elements = result['elements']
+        yield from elements
+        if not result.get('nextPage') or not elements:
+            return
+        pageSize = len(elements)
+        nextOffset = pageSize
+        # set by whichever worker first sees the end of the list, so no more pages get queued past it
+        lastPageSeen = threading.Event()
+
+        def fetch(offset):
+            res = self.get_request(url=_with_offset(url, offset))
+            if not res:
+                lastPageSeen.set()
+                return res
+            pageResult = res.json()['result']
+            if not pageResult.get('nextPage') or len(pageResult['elements']) < pageSize:
+                lastPageSeen.set()
+            return pageResult
+
+        pool = ThreadPoolExecutor(max_workers=prefetch)
+        pending = collections.deque()
+        try:
+            while True:
+                while len(pending) < prefetch and (not lastPageSeen.is_set() or not pending):
+                    pending.append(pool.submit(fetch, nextOffset))
+                    nextOffset += pageSize
+                result = pending.popleft().result()
+                if not isinstance(result, dict):  # the failed response
+                    failures.append(result)
+                    return
+                elements = result['elements']
+                yield from elements
+                if not result.get('nextPage') or not elements:
+                    return
+        finally:
+            # cancel_futures needs Python 3.9, so drop the queued pages by hand
+            for future in pending:
+                future.cancel()
+            pool.shutdown(wait=False)
+
+    def close(self):
+        self.session.close()
+
+
+class AsyncTransport:
+    def __init__(self, token: str, poolSize: int = 10, keepAlive: bool = True, timeout: float = 60,
+                 verbose: bool = False, rateLimiter: RateLimiter = None, maxRetries: int = 5):
+        """
+        asyncio counterpart of Transport, backed by a pooled httpx.AsyncClient
+
+        :param token: Qualtrics API key sent with every request
+        :param poolSize: Maximum number of connections kept open to the Qualtrics host
+        :param keepAlive: Reuse connections between requests
+        :param timeout: Seconds to wait for the server. None waits forever
+        :param verbose: Log every request
+        :param rateLimiter: Throttle requests through this RateLimiter. None disables throttling
+        :param maxRetries: How many times to retry a request rejected with 429 Too Many Requests
+        """
+        if httpx is None:
+            raise ImportError("AsyncTransport requires httpx (pip install httpx)")
+        self.token = token
+        self.header = {'X-API-TOKEN': self.token}
+        self.timeout = timeout
+        self.verbose = verbose
+        self.rateLimiter = rateLimiter
+        self.maxRetries = maxRetries
+        limits = httpx.Limits(max_connections=poolSize, max_keepalive_connections=poolSize if keepAlive else 0)
+        self.client = httpx.AsyncClient(headers=self.header, timeout=timeout, limits=limits)
+
+    async def _request(self, method, url, request_header=None, stream: bool = False, **kwargs):
+        path = httpx.URL(url).path
+        attempt = 0
+        while True:
+            if self.rateLimiter:
+                await self.rateLimiter.acquire_async(method, path)
+            if self.verbose:
+                logging.info("{} {}".format(method, url))
+            request = self.client.build_request(method, url, headers=request_header, **kwargs)
+            res = await self.client.send(request, stream=stream)
+            if res.status_code != 429 or attempt >= self.maxRetries:
+                return res
+            delay = _retry_after_seconds(res, default=2 ** attempt)
+            if self.verbose:
+                logging.info("Rate limited, retrying in {:.1f}s".format(delay))
+            await res.aclose()
+            if self.rateLimiter:
+                self.rateLimiter.back_off(delay)
+            else:
+                await asyncio.sleep(delay)
+            attempt += 1
+
+    async def get_request(self, url, request_header=None, stream: bool = False):
+        return await self._request('GET', url, request_header=request_header, stream=stream)
+
+    async def post_request(self, url, request_header=None, payload: dict = None):
+        return await self._request('POST', url, request_header=request_header, json=payload)
+
+    async def put_request(self, url, request_header=None, payload: dict = None):
+        return await self._request('PUT', url, request_header=request_header, json=payload)
+
+    async def delete_request(self, url, request_header=None):
+        return await self._request('DELETE', url, request_header=request_header)
+
+    async def iter_elements(self, url, offsetPaging: bool = False):
+        """
+        Async version of Transport.iter_elements
+        :return: async generator of element dicts
+        """
+        firstUrl = url
+        offset = 0
+        while url:
+            res = await self.get_request(url=url)
+            if not res.is_success:
+                return
+            result = res.json()['result']
+            elements = result['elements']
+            for element in elements:
+                yield element
+            if not result.get('nextPage') or not elements:
+                return
+            if offsetPaging:
+                offset += len(elements)
+                url = _with_offset(firstUrl, offset)
+            else:
+                url = result.get('nextPage')
+
+    async def close(self):
+        await self.client.aclose()
+
+
+class IndexedList(list):
+    def __init__(self, items=(), **indexes):
+        """
+        List of API objects that keeps a hash index per lookup key, so getters don't have to scan the list
+
+        :param items: Initial items
+        :param indexes: {'indexName': 'attribute'} or {'indexName': ('attribute1', 'attribute2')} for composite keys
+        """
+        super().__init__(items)
+        self.indexAttributes = indexes
+        self._reindex()
+
+    def _key(self, item, attributes):
+        if isinstance(attributes, tuple):
+            return tuple(getattr(item, attribute, None) for attribute in attributes)
+        return getattr(item, attributes, None)
+
+    def _index(self, item):
+        for indexName, attributes in self.indexAttributes.items():
+            key = self._key(item, attributes)
+            if key is not None:
+                self.indexes[indexName].setdefault(key, item)  # first match wins, same as a linear scan
+
+    def _reindex(self):
+        self.indexes = {indexName: {} for indexName in self.indexAttributes}
+        for item in self:
+            self._index(item)
+
+    def find(self, indexName, key):
+        """
+        Get the first item whose indexed attribute(s) equal key
+        :param indexName: Name of the index to search
+        :param key: Attribute value (tuple of values for composite indexes)
+        :return: matching item or None
+        """
+        if key is None:
+            return None
+        return self.indexes[indexName].get(key)
+
+    def upsert(self, item, indexName: str = 'id'):
+        """
+        Replace the item with the same key as item, or append it if there is none
+        :param item: New or refreshed item
+        :param indexName: Index identifying "the same" item
+        """
+        existing = self.find(indexName, self._key(item, self.indexAttributes[indexName]))
+        if existing is None:
+            self.append(item)
+            return
+        position = next(i for i, current in enumerate(self) if current is existing)
+        super().__setitem__(position, item)
+        self._reindex()
+
+    def discard(self, indexName: str, key):
+        """
+        Remove the item with this key, if there is one
+        :param indexName: Name of the index to search
+        :param key: Attribute value (tuple of values for composite indexes)
+        """
+        existing = self.find(indexName, key)
+        if existing is not None:
+            position = next(i for i, current in enumerate(self) if current is existing)
+            del self[position]
+
+    def append(self, item):
+        super().append(item)
+        self._index(item)
+
+    def extend(self, items):
+        items = list(items)
+        super().extend(items)
+        for item in items:
+            self._index(item)
+
+    def __iadd__(self, items):
+        self.extend(items)
+        return self
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._reindex()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._reindex()
+
+    def insert(self, index, item):
+        super().insert(index, item)
+        self._reindex()
+
+    def pop(self, index=-1):
+        item = super().pop(index)
+        self._reindex()
+        return item
+
+    def remove(self, item):
+        super().remove(item)
+        self._reindex()
+
+    def clear(self):
+        super().clear()
+        self._reindex()
+
+
+# column types of the metadata Qualtrics adds to every response export
+RESPONSE_METADATA_TYPES = {
+    'StartDate': 'datetime',
+    'EndDate': 'datetime',
+    'RecordedDate': 'datetime',
+    'Progress': 'number',
+    'Duration (in seconds)': 'number',
+    'Finished': 'boolean',
+    'LocationLatitude': 'number',
+    'LocationLongitude': 'number',
+}
+
+
+class ResponseList(collections.abc.Sequence):
+    def __init__(self, survey, rows: pd.DataFrame, labels: list = None, skipAPICalls: bool = False,
+                 projection: list = None):
+        """
+        A survey's responses as views over the rows of the single DataFrame the export was parsed into.
+        Response objects are only built when accessed, and stay alive only while something references them
+
+        :param survey: Survey the responses belong to
+        :param rows: One row per response, as exported (CSV cells as strings, JSON values as-is)
+        :param labels: Per-row label dicts, for JSON exports. Optional
+        :param projection: The columns rows was limited to when parsed, None if it holds every column
+        """
+        self.survey = survey
+        self.rows = rows.reset_index(drop=True)
+        self.labels = labels
+        self.projection = projection
+        self.skipAPICalls = skipAPICalls
+        self._responses = weakref.WeakValueDictionary()
+        self._positions = None
+        self._dates = {}
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        position = index + len(self) if index < 0 else index
+        if not 0 <= position < len(self):
+            raise IndexError('response index out of range')
+        response = self._responses.get(position)
+        if response is None:
+            record = self.rows.iloc[position:position + 1].to_dict('records')[0]
+            response = self._response(position, record)
+        return response
+
+    def __iter__(self):
+        columns = list(self.rows.columns)
+        for position, values in enumerate(self.rows.itertuples(index=False, name=None)):
+            response = self._responses.get(position)
+            yield response if response is not None else self._response(position, dict(zip(columns, values)))
+
+    def _response(self, position, record):
+        if self.labels is not None:  # JSON records only have the fields they were exported with
+            record = {k: v for k, v in record.items() if not (isinstance(v, float) and v != v)}
+        response = Response(data=record, survey=self.survey, qualtrics=self.survey.qualtrics,
+                            skipAPICalls=self.skipAPICalls)
+        if self.labels is not None:
+            response.labels = self.labels[position]
+        self._responses[position] = response
+        return response
+
+    def find(self, indexName, key):
+        """
+        Get the response with this id
+        :param indexName: 'id'
+        :param key: ResponseId
+        :return: Response or None
+        """
+        if indexName != 'id':
+            raise KeyError(indexName)
+        position = self._position(key)
+        return None if position is None else self[position]
+
+    def _position(self, responseId):
+        if responseId is None or 'ResponseId' not in self.rows.columns:
+            return None
+        if self._positions is None:
+            self._positions = {}
+            for position, rowId in enumerate(self.rows['ResponseId']):
+                self._positions.setdefault(rowId, position)  # first match wins, same as IndexedList
+        return self._positions.get(responseId)
+
+    def covers(self, columns: list = None):
+        """
+        :param columns: Export column names, None for all of them
+        :return: whether these rows were parsed with all of columns
+        """
+        if self.projection is None:
+            return True
+        return columns is not None and set(columns) <= set(self.projection)
+
+    def column(self, column):
+        """
+        :param column: Export column name
+        :return: the column's raw values as a pandas Series
+        """
+        if column not in self.rows.columns:
+            raise Exception("'{}' is not a valid response field".format(column))
+        return self.rows[column]
+
+    def dates(self, column):
+        """
+        :param column: Export column name
+        :return: the column parsed as datetimes, cached so repeated date filters only parse it once
+        """
+        if column not in self._dates:
+            self._dates[column] = _parse_dates(self.column(column))
+        return self._dates[column]
+
+    def select(self, mask):
+        """
+        :param mask: Boolean mask with one entry per response
+        :return: [Response, Response, ...] for the rows where mask is True, built only for those rows
+        """
+        return [self[position] for position in pd.Series(mask).to_numpy().nonzero()[0]]
+
+    def patch(self, updates: dict):
+        """
+        Overwrite fields of some responses in place, adding columns as needed
+        :param updates: {ResponseId: {field: value}}
+        :return: number of responses found and changed
+        """
+        changed = {}
+        for responseId, fields in updates.items():
+            position = self._position(responseId)
+            if position is not None:
+                changed[position] = fields
+        byField = collections.defaultdict(dict)
+        for position, fields in changed.items():
+            for field, value in fields.items():
+                byField[field][position] = value if self.labels is not None or value is None else str(value)
+        for field, values in byField.items():
+            if field not in self.rows.columns:
+                self.rows[field] = '' if self.labels is None else None
+            if self.rows[field].dtype != object and self.labels is not None:
+                self.rows[field] = self.rows[field].astype(object)
+            self.rows.iloc[list(values), self.rows.columns.get_loc(field)] = list(values.values())
+            self._dates.pop(field, None)
+        for position, response in list(self._responses.items()):
+            if position in changed:
+                response.data.update({field: byField[field][position] for field in changed[position]})
+                response.answers = None
+        return len(changed)
+
+    def without(self, response_ids):
+        """
+        :param response_ids: ResponseIds to leave out
+        :return: new ResponseList over the remaining rows
+        """
+        keep = ~self.rows['ResponseId'].isin(set(response_ids))
+        labels = [label for label, kept in zip(self.labels, keep) if kept] if self.labels is not None else None
+        return ResponseList(self.survey, self.rows[keep], labels=labels, skipAPICalls=self.skipAPICalls,
+                            projection=self.projection)
+
+
+# JSON export field names for the response metadata, mapped to the CSV column names Response reads
+JSON_RESPONSE_FIELDS = {
+    'startDate': 'StartDate',
+    'endDate': 'EndDate',
+    'status': 'Status',
+    'ipAddress': 'IPAddress',
+    'progress': 'Progress',
+    'duration': 'Duration (in seconds)',
+    'finished': 'Finished',
+    'recordedDate': 'RecordedDate',
+    '_recordId': 'ResponseId',
+    'recipientFirstName': 'RecipientFirstName',
+    'recipientLastName': 'RecipientLastName',
+    'recipientEmail': 'RecipientEmail',
+    'externalDataReference': 'ExternalReference',
+    'locationLatitude': 'LocationLatitude',
+    'locationLongitude': 'LocationLongitude',
+    'distributionChannel': 'DistributionChannel',
+    'userLanguage': 'UserLanguage',
+}
+# export formats kept zipped and parsed incrementally rather than extracted
+STREAMED_EXPORT_FORMATS = ['json', 'ndjson']
+
+
+def _json_response_values(record: dict):
+    values = {JSON_RESPONSE_FIELDS.get(k, k): v for k, v in record.get('values', {}).items()}
+    if 'ResponseId' not in values and record.get('responseId'):
+        values['ResponseId'] = record['responseId']
+    return values
+
+
+def _iter_json_records(f, fileFormat: str):
+    # the raw response records of a JSON ({"responses": [...]}) or NDJSON (one per line) export
+    if fileFormat == 'ndjson':
+        return (json.loads(line) for line in f if line.strip())
+    return _iter_json_array(f, key='responses')
+
+
+def _iter_json_array(f, key: str, chunkSize: int = 64 * 1024):
+    # yield the objects of a document's top-level "key": [...] array, holding at most a chunk plus one object
+    decoder = json.JSONDecoder()
+    start = re.compile(r'"{}"\s*:\s*\['.format(re.escape(key)))
+    buffer = ''
+    while True:
+        chunk = f.read(chunkSize)
+        if not chunk:
+            raise ValueError('no "{}" array in the JSON document'.format(key))
+        buffer += chunk
+        match = start.search(buffer)
+        if match:
+            buffer = buffer[match.end():]
+            break
+        buffer = buffer[-(len(key) + 32):]  # the key may be split across chunks
+    while True:
+        buffer = buffer.lstrip(' \t\r\n,')
+        if buffer.startswith(']'):
+            return
+        try:
+            item, end = decoder.raw_decode(buffer)
+        except ValueError:  # incomplete object, read more
+            chunk = f.read(chunkSize)
+            if not chunk:
+                raise ValueError('"{}" array is truncated or malformed: {!r}'.format(key, buffer[:80]))
+            buffer += chunk
+            continue
+        yield item
+        buffer = buffer[end:]
+
+
+# question types whose answers are free text, even when they happen to look like numbers (zip codes, ids, ...)
+TEXT_QUESTION_TYPES = ['TE', 'Captcha', 'Meta', 'Draw', 'FileUpload']
+
+
+def _response_schema(survey, columns):
+    # column -> 'datetime' / 'number' / 'boolean' / 'string' / None (infer), using whichever questions are loaded
+    questionTypes = {}
+    for question in survey._questions or []:  # whatever is loaded, never an API call
+        tag = question.data.get('DataExportTag') or question.id
+        if tag:
+            questionTypes[tag] = question.questionType
+    schema = {}
+    for column in columns:
+        if column in RESPONSE_METADATA_TYPES:
+            schema[column] = RESPONSE_METADATA_TYPES[column]
+            continue
+        schema[column] = None
+        if column.endswith('_TEXT'):
+            schema[column] = 'string'
+            continue
+        for tag, questionType in questionTypes.items():
+            if column == tag or column.startswith(tag + '_'):
+                if questionType in TEXT_QUESTION_TYPES:
+                    schema[column] = 'string'
+                break
+    return schema
+
+
+def _parse_numbers(values: pd.Series):
+    # exported number strings -> float64 (int64 if nothing is missing or fractional), None if any cell isn't a
+    # number. numpy's own string conversion, which is several times faster than pd.to_numeric on text
+    cells = values.to_numpy(dtype=object, na_value='nan')
+    cells[cells == ''] = 'nan'
+    try:
+        numbers = cells.astype('float64')
+    except (TypeError, ValueError):
+        return None
+    numbers = pd.Series(numbers, index=values.index)
+    if numbers.notna().all() and (numbers % 1 == 0).all() and numbers.abs().max() < 2 ** 53:
+        return numbers.astype('int64')
+    return numbers
+
+
+def _typed_responses_frame(frame: pd.DataFrame, schema: dict, inferred: bool = False):
+    # frame holds the values of a JSON export or raw CSV strings, or with inferred, comes from _read_typed_csv
+    # where pandas has already typed everything it could; then only the schema's columns still need converting
+    typed = {}
+    for column in frame.columns:
+        values = frame[column]
+        columnType = schema.get(column)
+        textual = values.dtype == object or pd.api.types.is_string_dtype(values)
+        if textual and not inferred:
+            numbers = None
+            if columnType in [None, 'number'] and (values.dtype != object
+                                                   or pd.api.types.infer_dtype(values, skipna=True) == 'string'):
+                numbers = _parse_numbers(values)
+            if numbers is not None:
+                typed[column] = numbers
+                continue
+            values = values.mask(values == '')
+        if columnType == 'datetime':
+            typed[column] = pd.to_datetime(values, errors='coerce')
+        elif columnType == 'boolean':
+            if pd.api.types.is_bool_dtype(values):
+                typed[column] = values.astype('boolean')
+            else:
+                typed[column] = values.map({'True': True, 'False': False, '1': True, '0': False, 'true': True,
+                                            'false': False, True: True, False: False, 1: True, 0: False}
+                                           ).astype('boolean')
+        elif columnType == 'number':
+            typed[column] = pd.to_numeric(values, errors='coerce')
+        elif columnType == 'string' or inferred:  # with inferred, pandas already found text in it
+            typed[column] = values if not textual else values.astype('string')
+        elif not textual:
+            typed[column] = values  # numbers/booleans as exported in JSON
+        else:
+            kind = pd.api.types.infer_dtype(values, skipna=True)
+            if kind.startswith('mixed') and values.map(lambda value: isinstance(value, (list, dict))).any():
+                typed[column] = values  # JSON multi-value answers stay as lists
+            elif kind in ['integer', 'floating', 'mixed-integer-float', 'decimal']:
+                typed[column] = pd.to_numeric(values, errors='coerce')
+            else:  # text; numbers were caught by _parse_numbers above
+                typed[column] = values.astype('string')
+    return pd.DataFrame(typed, index=frame.index)
+
+
+def _read_typed_csv(path: str, survey, columns=None, chunksize: int = None):
+    """
+    Parse a CSV export with pandas' own type inference, forcing the schema's text columns to strings so ids and zip
+    codes keep their leading zeros. Returns one typed DataFrame, or an iterator of them with chunksize
+    """
+    header = pd.read_csv(path, nrows=0).columns
+    if columns:
+        header = [column for column in header if column in columns]
+    schema = _response_schema(survey, header)
+    dtype = {column: 'string' for column, columnType in schema.items() if columnType == 'string'}
+    # first two rows are just a repeat of column headers, skip them. Only empty cells are missing, never 'NA'
+    frames = pd.read_csv(path, skiprows=[1, 2], dtype=dtype, keep_default_na=False, na_values=[''],
+                         usecols=(lambda column: column in columns) if columns else None, chunksize=chunksize,
+                         low_memory=False)
+    if chunksize:
+        return (_typed_responses_frame(frame, schema, inferred=True) for frame in frames)
+    return _typed_responses_frame(frames, schema, inferred=True)
+
+
+class ResponseStore:
+    def __init__(self, fileFormat: str = 'parquet', folder: str = None):
+        """
+        Keeps each survey's responses as a typed columnar file, converted once from the CSV export and then
+        read back memory-mapped, loading only the columns asked for. Requires pyarrow
+
+        :param fileFormat: 'parquet' or 'feather'
+        :param folder: Where to keep the files. Defaults to each survey's response folder
+        """
+        if pyarrow is None:
+            raise ImportError("ResponseStore requires pyarrow (pip install pyarrow)")
+        if fileFormat not in ['parquet', 'feather']:
+            raise Exception("fileFormat must be 'parquet' or 'feather'")
+        self.fileFormat = fileFormat
+        self.folder = folder
+
+    def path(self, survey):
+        return "{}/{}.{}".format(self.folder or survey.responseFolder, survey.name, self.fileFormat)
+
+    def is_current(self, survey):
+        """
+        Whether the stored file is at least as new as the survey's responses file
+        """
+        path = self.path(survey)
+        if not os.path.exists(path):
+            return False
+        if survey.responsesFile and os.path.exists(survey.responsesFile):
+            return os.path.getmtime(path) >= os.path.getmtime(survey.responsesFile)
+        return True
+
+    def write(self, survey, responsesFile: str = None):
+        """
+        Convert a CSV export into the store
+        :param survey: Survey the export belongs to
+        :param responsesFile: CSV export to convert. Defaults to survey.responsesFile
+        :return: path of the stored file
+        """
+        responsesFile = responsesFile or survey.responsesFile
+        if (responsesFile == survey.responsesFile and isinstance(survey.responses, ResponseList)
+                and survey.responses.covers()):
+            raw = survey.responses.rows  # already parsed in full, don't parse again
+            frame = _typed_responses_frame(raw, _response_schema(survey, raw.columns))
+        elif survey._responses_format(responsesFile) == 'csv':
+            frame = _read_typed_csv(responsesFile, survey)
+        else:
+            raw, labels = survey._read_response_rows()
+            frame = _typed_responses_frame(raw, _response_schema(survey, raw.columns))
+        path = self.path(survey)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        if self.fileFormat == 'parquet':
+            frame.to_parquet(path, index=False)
+        else:
+            frame.reset_index(drop=True).to_feather(path)
+        return path
+
+    def read(self, survey, columns: list = None):
+        """
+        Load a survey's responses from the store
+        :param survey: Survey to load
+        :param columns: Only load these columns. Optional
+        :return: pandas DataFrame
+        """
+        if self.fileFormat == 'parquet':
+            table = pyarrow.parquet.read_table(self.path(survey), columns=columns, memory_map=True)
+        else:
+            table = pyarrow.feather.read_table(self.path(survey), columns=columns, memory_map=True)
+        return table.to_pandas()
 
 
-def get_request(url, request_header=None, payload: dict = None, stream: bool = False):
-    if verboseRequests:
-        logging.info("GET {}".format(url))
-    return requests.get(url, headers=(request_header if request_header else header), data=payload, stream=stream)
+class MetadataCache:
+    def __init__(self, folder: str, maxAge: float = 3600, backgroundRefresh: bool = True):
+        """
+        SQLite snapshot of an organization's surveys, users, groups, mailing lists, libraries, survey definitions
+        and questions, so a new Qualtrics instance can start from disk instead of listing everything again
 
+        :param folder: Directory holding metadata.sqlite. Shared by every process and API token using it
+        :param maxAge: Seconds after which a snapshot is stale and refreshed from the API
+        :param backgroundRefresh: Refresh stale snapshots on a background thread, using the stale data meanwhile.
+            False refreshes before the Qualtrics instance is returned
+        """
+        self.folder = folder
+        self.maxAge = maxAge
+        self.backgroundRefresh = backgroundRefresh
+        self.path = os.path.join(folder, 'metadata.sqlite')
+        os.makedirs(folder, exist_ok=True)
+        with self._connect() as db:
+            db.execute('CREATE TABLE IF NOT EXISTS objects (namespace TEXT, collection TEXT, id TEXT, data TEXT, '
+                       'storedAt REAL, PRIMARY KEY (namespace, collection, id))')
+            db.execute('CREATE TABLE IF NOT EXISTS snapshots (namespace TEXT, collection TEXT, storedAt REAL, '
+                       'PRIMARY KEY (namespace, collection))')
 
-def post_request(url, request_header=None, payload: dict = None):
-    if verboseRequests:
-        logging.info("POST {}".format(url))
-    return requests.post(url, headers=(request_header if request_header else header), json=payload)
+    def _connect(self):
+        # a connection per operation, so refresh threads never share one
+        return sqlite3.connect(self.path, timeout=30)
 
+    @staticmethod
+    def namespace(baseUrl: str, token: str):
+        # separates organizations and tokens without keeping the token itself on disk
+        return hashlib.sha256('{} {}'.format(baseUrl, token).encode()).hexdigest()[:32]
 
-def put_request(url, request_header=None, payload: dict = None):
-    if verboseRequests:
-        logging.info("PUT {}".format(url))
-    return requests.put(url, headers=(request_header if request_header else header), json=payload)
+    def save_collection(self, namespace: str, collection: str, items: list):
+        """
+        Replace a stored collection
+        :param items: [(id, data dict), ...]
+        """
+        storedAt = time.time()
+        with self._connect() as db:
+            db.execute('DELETE FROM objects WHERE namespace = ? AND collection = ?', (namespace, collection))
+            db.executemany('INSERT OR REPLACE INTO objects VALUES (?, ?, ?, ?, ?)',
+                           [(namespace, collection, id, json.dumps(data), storedAt) for id, data in items])
+            db.execute('INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?)', (namespace, collection, storedAt))
 
+    def load_collection(self, namespace: str, collection: str):
+        """
+        :return: ([data dict, ...], storedAt), or (None, None) if the collection was never stored
+        """
+        with self._connect() as db:
+            snapshot = db.execute('SELECT storedAt FROM snapshots WHERE namespace = ? AND collection = ?',
+                                  (namespace, collection)).fetchone()
+            if not snapshot:
+                return None, None
+            rows = db.execute('SELECT data FROM objects WHERE namespace = ? AND collection = ? ORDER BY rowid',
+                              (namespace, collection)).fetchall()
+        return [json.loads(data) for data, in rows], snapshot[0]
 
-def delete_request(url, request_header=None):
-    if verboseRequests:
-        logging.info("DELETE {}".format(url))
-    return requests.delete(url, headers=(request_header if request_header else header))
+    def save_item(self, namespace: str, collection: str, id: str, data):
+        with self._connect() as db:
+            db.execute('INSERT OR REPLACE INTO objects VALUES (?, ?, ?, ?, ?)',
+                       (namespace, collection, id, json.dumps(data), time.time()))
+
+    def load_item(self, namespace: str, collection: str, id: str):
+        """
+        :return: the stored data, or None if missing or older than maxAge
+        """
+        with self._connect() as db:
+            row = db.execute('SELECT data, storedAt FROM objects WHERE namespace = ? AND collection = ? AND id = ?',
+                             (namespace, collection, id)).fetchone()
+        if not row or self.is_stale(row[1]):
+            return None
+        return json.loads(row[0])
+
+    def delete_item(self, namespace: str, collection: str, id: str):
+        with self._connect() as db:
+            db.execute('DELETE FROM objects WHERE namespace = ? AND collection = ? AND id = ?',
+                       (namespace, collection, id))
+
+    def expire_collection(self, namespace: str, collection: str):
+        """
+        Mark a stored collection stale, so the next Qualtrics instance refreshes it
+        """
+        with self._connect() as db:
+            db.execute('UPDATE snapshots SET storedAt = NULL WHERE namespace = ? AND collection = ?',
+                       (namespace, collection))
+
+    def is_stale(self, storedAt):
+        return storedAt is None or time.time() - storedAt > self.maxAge
+
+
+def _store_changed(qualtrics, collection: str, item, item_id: str = None):
+    """
+    Record an object created or changed through the API in the loaded collection, and write it through to the
+    MetadataCache so the next process doesn't start from the old version
+    :param item: The object as fetched back from the API. None if that failed; the snapshot is then expired instead
+    :param item_id: Id of the changed object, to drop its cached survey definition and questions
+    """
+    if item is not None and getattr(qualtrics, collection):
+        getattr(qualtrics, collection).upsert(item)
+    metadataCache = getattr(qualtrics, 'metadataCache', None)
+    if metadataCache:
+        if item is not None:
+            dump = qualtrics._metadata_collections()[collection][1]
+            metadataCache.save_item(qualtrics._metadataNamespace, collection, item.id, dump(item))
+        else:
+            metadataCache.expire_collection(qualtrics._metadataNamespace, collection)
+        if collection == 'surveys' and (item_id or item is not None):
+            _forget_survey_definition(qualtrics, item_id or item.id)
+
+
+def _store_removed(qualtrics, collection: str, item_id: str):
+    # counterpart of _store_changed for deleted objects
+    getattr(qualtrics, collection).discard('id', item_id)
+    metadataCache = getattr(qualtrics, 'metadataCache', None)
+    if metadataCache:
+        metadataCache.delete_item(qualtrics._metadataNamespace, collection, item_id)
+        if collection == 'surveys':
+            _forget_survey_definition(qualtrics, item_id)
+
+
+def _forget_survey_definition(qualtrics, survey_id: str):
+    metadataCache = getattr(qualtrics, 'metadataCache', None)
+    if metadataCache:
+        for collection in ['survey_definitions', 'survey_questions']:
+            metadataCache.delete_item(qualtrics._metadataNamespace, collection, survey_id)
 
 
 class PermissionSet:
@@ -70,52 +1285,210 @@ class PermissionSet:
 
 class Qualtrics:
     def __init__(self, qualtricsUrl: str, qualtricsToken: str, surveyResponseFolder: str = None,
-                 skipAPICalls: bool = True, verbose: bool = False):
+                 skipAPICalls: bool = True, verbose: bool = False, poolSize: int = 10, keepAlive: bool = True,
+                 timeout: float = 60, rateLimiter: RateLimiter = None, maxRetries: int = 5,
+                 responseStore: ResponseStore = None, cache: HTTPCache = None, metadataCache: MetadataCache = None):
         """
 
         :param qualtricsUrl: Your organizational base URL (likely https://yourorganization.qualtrics.com/API/v3)
         :param qualtricsToken: Your Qualtrics API key
         :param surveyResponseFolder: Where survey responses should be downloaded to
         :param skipAPICalls:
-        False: Make several Qualtrics API calls to create all object attributes.
-            Responses CSV files will be downloaded for every survey in your organization.
+        False: Make several Qualtrics API calls to create all object attributes, concurrently (see bootstrap()).
         True: Certain attributes will have to be manually called from the API at a later time
             (i.e. Qualtrics.get_surveys(), Qualtrics.get_users())
+        :param verbose: Log every API request
+        :param poolSize: Maximum number of pooled connections to the Qualtrics API
+        :param keepAlive: Reuse connections between API calls
+        :param timeout: Seconds to wait for the Qualtrics API before giving up on a request
+        :param rateLimiter: RateLimiter shared by every API call made through this instance.
+            Defaults to one enforcing Qualtrics' published per-endpoint and brand-wide quotas
+        :param maxRetries: How many times to retry a request rejected with 429 Too Many Requests
+        :param responseStore: Keep downloaded responses in this ResponseStore (Parquet/Feather) for fast reloads.
+            Optional
+        :param cache: Serve repeated GET requests from this HTTPCache, revalidating with ETags. Optional
+        :param metadataCache: Start from (and keep up to date) this on-disk MetadataCache. Optional.
+            A stale snapshot is refreshed on Qualtrics.metadataRefresh (a thread); its exception, if any, is kept in
+            Qualtrics.metadataRefreshError
         """
-        global header, verboseRequests
         self.baseUrl = qualtricsUrl
         self.token = qualtricsToken
         self.header = {'X-API-TOKEN': self.token}
-        header = self.header
-        verboseRequests = verbose
+        self.responseStore = responseStore
+        self.rateLimiter = rateLimiter if rateLimiter else RateLimiter()
+        self.transport = Transport(token=self.token, poolSize=poolSize, keepAlive=keepAlive, timeout=timeout,
+                                   verbose=verbose, rateLimiter=self.rateLimiter, maxRetries=maxRetries,
+                                   cache=cache)
         self.skipAPICalls = skipAPICalls
         self.responseFolder = surveyResponseFolder
-        self.surveys = []
-        self.users = []
-        self.mailing_lists = []
-        self.libraries = []
-        self.groups = []
-        if not self.skipAPICalls:  # will trigger a bunch of API calls, including downloading results files for every survey
-            self.get_surveys()
-            self.get_users()
-            self.get_mailing_lists()
-            self.get_libraries()
-            self.get_groups()
+        self.surveys = IndexedList(id='id', name='name')
+        self.users = IndexedList(id='id', username='username')
+        self.mailing_lists = IndexedList(id='id', name='name')
+        self.libraries = IndexedList(id='id', name='name')
+        self.groups = IndexedList(id='id', name='name')
+        self.bootstrapTimings = {}
+        self.metadataCache = metadataCache
+        self.metadataRefresh = None
+        self.metadataRefreshError = None
+        stale, cached = True, False
+        if self.metadataCache:
+            self._metadataNamespace = MetadataCache.namespace(self.baseUrl, self.token)
+            stale = self.load_metadata_cache()
+            cached = any([self.surveys, self.users, self.groups, self.mailing_lists, self.libraries])
+        if stale and (not self.skipAPICalls or cached):
+            # skipAPICalls=False will trigger a bunch of API calls, see bootstrap()
+            refresh = self.bootstrap if not self.skipAPICalls else self.refresh_metadata_cache
+            if cached and self.metadataCache.backgroundRefresh:  # serve the stale snapshot meanwhile
+                self.metadataRefresh = threading.Thread(target=self._refresh_in_background, args=(refresh,),
+                                                        daemon=True)
+                self.metadataRefresh.start()
+            else:
+                refresh()
+
+    def _refresh_in_background(self, refresh):
+        # nobody joins the thread, so keep the failure where it can be seen: the log and metadataRefreshError
+        try:
+            refresh()
+        except Exception as e:
+            logging.error("Background metadata refresh failed: {}".format(e))
+            self.metadataRefreshError = e
+
+    # collection -> (key attribute, object -> stored data, stored data -> object)
+    def _metadata_collections(self):
+        return {
+            'surveys': ('id', lambda survey: survey.json,
+                        lambda data: Survey(data=data, qualtrics=self, responseFolder=self.responseFolder,
+                                            skipAPICalls=self.skipAPICalls)),
+            'users': ('username', lambda user: user.data,
+                      lambda data: User(data=data, qualtrics=self, skipAPICalls=False)),
+            'groups': ('name', lambda group: group.data, lambda data: Group(data=data, qualtrics=self)),
+            'mailing_lists': ('name', lambda mailing_list: mailing_list.data,
+                              lambda data: MailingList(data=data, qualtrics=self, skipAPICalls=True)),
+            'libraries': ('name', lambda library: library.data,
+                          lambda data: Library(data=data, qualtrics=self, skipAPICalls=True)),
+        }
+
+    def load_metadata_cache(self):
+        """
+        Fill Qualtrics.surveys, users, groups, mailing_lists and libraries from the MetadataCache
+        :return: True if anything was missing or older than the cache's maxAge
+        """
+        stale = False
+        for collection, (secondIndex, dump, build) in self._metadata_collections().items():
+            items, storedAt = self.metadataCache.load_collection(self._metadataNamespace, collection)
+            stale = stale or self.metadataCache.is_stale(storedAt)
+            if items is not None:
+                setattr(self, collection, IndexedList([build(data) for data in items],
+                                                      **{'id': 'id', secondIndex: secondIndex}))
+        return stale
+
+    def _store_metadata(self, collection):
+        if self.metadataCache:
+            dump = self._metadata_collections()[collection][1]
+            self.metadataCache.save_collection(self._metadataNamespace, collection,
+                                               [(item.id, dump(item)) for item in getattr(self, collection)])
+
+    def refresh_metadata_cache(self, max_workers: int = 8):
+        """
+        List surveys, users, groups, mailing lists and libraries again (concurrently), updating the MetadataCache
+        :return: {collection: seconds taken}
+        """
+        return self.bootstrap(phases=list(self._metadata_collections()), max_workers=max_workers)
+
+    def _bootstrap_phases(self):
+        # phase -> (phases it needs first, load run once, units fanned out afterwards)
+        return {
+            'users': ([], lambda: self.get_users(forceUpdate=True), None),
+            'groups': ([], lambda: self.get_groups(forceUpdate=True), None),
+            'surveys': ([], lambda: self.get_surveys(forceUpdate=True), None),
+            'mailing_lists': ([], lambda: self.get_mailing_lists(forceUpdate=True, skipAPICalls=True), None),
+            'libraries': ([], lambda: self.get_libraries(forceUpdate=True, skipAPICalls=True), None),
+            'survey_details': (['surveys', 'users'], None,
+                               lambda: [functools.partial(survey.prefetch, resource) for survey in self.surveys
+                                        for resource in ['questions', 'quotas', 'flow', 'owner']]),
+            'contacts': (['mailing_lists'], None,
+                         lambda: [mailing_list.get_contacts for mailing_list in self.mailing_lists]),
+            'library_surveys': (['libraries'], None, lambda: [library.get_surveys for library in self.libraries]),
+        }
+
+    def bootstrap(self, phases: list = None, max_workers: int = 8, on_progress=None):
+        """
+        Load the whole organization (what skipAPICalls=False does), running independent phases and the per-object
+        calls inside each phase concurrently
+        :param phases: Any of 'users', 'groups', 'surveys', 'mailing_lists', 'libraries', 'survey_details'
+            (questions, quotas, flow and owner of every survey), 'contacts', 'library_surveys'.
+            Phases they depend on are added. Defaults to all of them
+        :param max_workers: API calls in flight at once
+        :param on_progress: Called as on_progress(phase, done, total) whenever a unit of work finishes. Optional
+        :return: {phase: seconds taken}, also kept in Qualtrics.bootstrapTimings
+        """
+        definitions = self._bootstrap_phases()
+        wanted = set()
+        pending = list(phases or definitions)
+        while pending:
+            phase = pending.pop()
+            if phase not in definitions:
+                raise Exception("'{}' is not a bootstrap phase".format(phase))
+            if phase not in wanted:
+                wanted.add(phase)
+                pending.extend(definitions[phase][0])
+
+        def run_phase(phase):
+            dependencies, load, units = definitions[phase]
+            if load:
+                load()
+            return list(units()) if units else []
+
+        started, finished, done, total, timings = {}, set(), {}, {}, {}
+        running = {}  # future -> phase
+        pool = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            while len(finished) < len(wanted):
+                for phase in sorted(wanted - set(started)):
+                    if set(definitions[phase][0]) <= finished:
+                        started[phase] = time.monotonic()
+                        done[phase], total[phase] = 0, 1
+                        running[pool.submit(run_phase, phase)] = phase
+                completed, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    phase = running.pop(future)
+                    result = future.result()
+                    if done[phase] == 0:  # the phase itself, fan out its units
+                        total[phase] += len(result)
+                        for unit in result:
+                            running[pool.submit(unit)] = phase
+                    done[phase] += 1
+                    if on_progress:
+                        on_progress(phase, done[phase], total[phase])
+                    if done[phase] == total[phase]:
+                        finished.add(phase)
+                        timings[phase] = time.monotonic() - started[phase]
+                        if self.transport.verbose:
+                            logging.info("Bootstrap phase '{}' took {:.1f}s ({} calls)".format(
+                                phase, timings[phase], total[phase]))
+        except BaseException:
+            for future in running:
+                future.cancel()
+            raise
+        finally:
+            pool.shutdown(wait=True)
+        self.bootstrapTimings = timings
+        return timings
 
     def who_am_i(self, skipAPICalls: bool = False):
-        res = get_request('{baseUrl}/whoami'.format(baseUrl=self.baseUrl))
+        res = self.transport.get_request('{baseUrl}/whoami'.format(baseUrl=self.baseUrl))
         if res:
             return User(data=res.json()['result'], qualtrics=self, skipAPICalls=skipAPICalls)
         return None
 
     def get_organization(self, organization_id: str, skipAPICalls: bool = False):
-        res = get_request('{baseUrl}/organizations/{org_id}'.format(baseUrl=self.baseUrl, org_id=organization_id))
+        res = self.transport.get_request('{baseUrl}/organizations/{org_id}'.format(baseUrl=self.baseUrl, org_id=organization_id))
         if res:
             return Organization(data=res.json['result'], qualtrics=self, skipAPICalls=skipAPICalls)
         return None
 
     def get_division(self, division_id: str, skipAPICalls: bool = False):
-        res = get_request('{baseUrl}/organizations/{div_id}'.format(baseUrl=self.baseUrl, div_id=division_id))
+        res = self.transport.get_request('{baseUrl}/organizations/{div_id}'.format(baseUrl=self.baseUrl, div_id=division_id))
         if res:
             return Division(data=res.json['result'], qualtrics=self, skipAPICalls=skipAPICalls)
         return None
@@ -127,7 +1500,7 @@ class Qualtrics:
             data['divisionAdmins'] = [user for user in admin_user_id]
         if permissions:
             data['permissions'] = permissions.data
-        res = post_request(url='{}/divisions'.format(self.baseUrl), payload=data)
+        res = self.transport.post_request(url='{}/divisions'.format(self.baseUrl), payload=data)
         if res:
             if returnNewDivision:
                 new_division_id = res.json()['result']['id']
@@ -137,23 +1510,26 @@ class Qualtrics:
             return None
         return False
 
-    def get_groups(self, _carriedGroups=None, _offset=0, forceUpdate: bool = False, skipAPICalls: bool = False):
-        if forceUpdate or not self.surveys:
-            time.sleep(1)  # have to wait for API server to catch up
-            groups = []
-            if _carriedGroups:
-                groups = _carriedGroups
-            res = get_request(
-                url='{}/groups{}'.format(self.baseUrl, "?offset={}".format(_offset) if _offset > 0 else ""))
-            if res:
-                for group in res.json()['result']['elements']:
-                    groups.append(Group(data=groups, qualtrics=self, skipAPICalls=skipAPICalls))
-                if res.json()['result'].get('nextPage'):
-                    groups = self.get_groups(_carriedGroups=groups,
-                                             _offset=_offset + int(res.json()['result'].get('nextPage')),
-                                             forceUpdate=forceUpdate,
-                                             skipAPICalls=skipAPICalls)
+    def iter_groups(self, prefetch: int = 0, skipAPICalls: bool = False, failures: list = None):
+        """
+        Stream groups from the API page by page. Does not use or update Qualtrics.groups
+        :param prefetch: Download up to this many upcoming pages concurrently. Optional
+        :param failures: Gets the response of a page that failed and cut the stream short. Optional
+        :return: generator of Group objects
+        """
+        for group in self.transport.iter_elements(url='{}/groups'.format(self.baseUrl), offsetPaging=True,
+                                                  prefetch=prefetch, failures=failures):
+            yield Group(data=group, qualtrics=self, skipAPICalls=skipAPICalls)
+
+    def get_groups(self, forceUpdate: bool = False, prefetch: int = 0, skipAPICalls: bool = False):
+        if forceUpdate or not self.groups:
+            failures = []
+            groups = IndexedList(self.iter_groups(prefetch=prefetch, skipAPICalls=skipAPICalls, failures=failures),
+                                 id='id', name='name')
+            if failures:  # a page failed, keep whatever was there rather than a partial list
+                return None
             self.groups = groups
+            self._store_metadata('groups')
         return self.groups
 
     def get_group(self, group_id: str = None, group_name: str = None, forceUpdate: bool = False,
@@ -162,11 +1538,16 @@ class Qualtrics:
             return None
         groups = self.get_groups(forceUpdate=forceUpdate, skipAPICalls=skipAPICalls)
         if groups:
-            for group in groups:
-                if group_id and group_id == group.id:
-                    return group
-                if group_name and group_name == group.name:
-                    return group
+            return groups.find('id', group_id) or groups.find('name', group_name)
+        return None
+
+    def fetch_group(self, group_id: str, skipAPICalls: bool = False):
+        """
+        Download a single group, bypassing Qualtrics.groups
+        """
+        res = self.transport.get_request(url='{}/groups/{}'.format(self.baseUrl, group_id))
+        if res:
+            return Group(data=res.json()['result'], qualtrics=self, skipAPICalls=skipAPICalls)
         return None
 
     def create_group(self, group_type: str, group_name: str, division_id: str = None, returnNewGroup: bool = True,
@@ -175,35 +1556,38 @@ class Qualtrics:
                 'name': group_name}
         if division_id:
             data['divisionId'] = division_id
-        res = post_request(url='{}/groups'.format(self.baseUrl), payload=data)
+        res = self.transport.post_request(url='{}/groups'.format(self.baseUrl), payload=data)
         if res:
-            self.get_groups(forceUpdate=True, skipAPICalls=skipAPICalls)
-            if returnNewGroup:
-                new_group_id = res.json()['result']['id']
-                return self.get_group(group_id=new_group_id, skipAPICalls=skipAPICalls)
+            if returnNewGroup or self.groups or self.metadataCache:
+                new_group = self.fetch_group(group_id=res.json()['result']['id'], skipAPICalls=skipAPICalls)
+                _store_changed(self, 'groups', new_group)
+                if returnNewGroup:
+                    return new_group
             return True
         if returnNewGroup:
             return None
         return False
 
-    def get_surveys(self, _carriedSurveys=None, _offset=0, forceUpdate: bool = False, skipAPICalls: bool = False):
+    def iter_surveys(self, prefetch: int = 0, skipAPICalls: bool = False, failures: list = None):
+        """
+        Stream surveys from the API page by page. Does not use or update Qualtrics.surveys
+        :param prefetch: Download up to this many upcoming pages concurrently. Optional
+        :param failures: Gets the response of a page that failed and cut the stream short. Optional
+        :return: generator of Survey objects
+        """
+        for survey in self.transport.iter_elements(url='{}/surveys'.format(self.baseUrl), offsetPaging=True,
+                                                   prefetch=prefetch, failures=failures):
+            yield Survey(data=survey, qualtrics=self, responseFolder=self.responseFolder, skipAPICalls=skipAPICalls)
+
+    def get_surveys(self, forceUpdate: bool = False, prefetch: int = 0, skipAPICalls: bool = False):
         if forceUpdate or not self.surveys:
-            time.sleep(1)  # have to wait for API server to catch up
-            surveys = []
-            if _carriedSurveys:
-                surveys = _carriedSurveys
-            res = get_request(
-                url='{}/surveys{}'.format(self.baseUrl, "?offset={}".format(_offset) if _offset > 0 else ""))
-            if res:
-                for survey in res.json()['result']['elements']:
-                    surveys.append(Survey(data=survey, qualtrics=self, responseFolder=self.responseFolder,
-                                          skipAPICalls=skipAPICalls))
-                if res.json()['result'].get('nextPage'):
-                    surveys = self.get_surveys(_carriedSurveys=surveys,
-                                               _offset=_offset + 100,
-                                               forceUpdate=forceUpdate,
-                                               skipAPICalls=skipAPICalls)
+            failures = []
+            surveys = IndexedList(self.iter_surveys(prefetch=prefetch, skipAPICalls=skipAPICalls, failures=failures),
+                                  id='id', name='name')
+            if failures:  # a page failed, keep whatever was there rather than a partial list
+                return None
             self.surveys = surveys
+            self._store_metadata('surveys')
         return self.surveys
 
     def get_survey(self, survey_id: str = None, survey_name: str = None, forceUpdate: bool = False,
@@ -212,11 +1596,17 @@ class Qualtrics:
             return None
         surveys = self.get_surveys(forceUpdate=forceUpdate, skipAPICalls=skipAPICalls)
         if surveys:
-            for survey in surveys:
-                if survey_id and survey_id == survey.id:
-                    return survey
-                if survey_name and survey_name == survey.name:
-                    return survey
+            return surveys.find('id', survey_id) or surveys.find('name', survey_name)
+        return None
+
+    def fetch_survey(self, survey_id: str, skipAPICalls: bool = False):
+        """
+        Download a single survey, bypassing Qualtrics.surveys
+        """
+        res = self.transport.get_request(url='{}/surveys/{}'.format(self.baseUrl, survey_id))
+        if res:
+            return Survey(data=res.json()['result'], qualtrics=self, responseFolder=self.responseFolder,
+                          skipAPICalls=skipAPICalls)
         return None
 
     def get_survey_details(self, survey_id: str = None, survey_name: str = None, skipAPICalls: bool = False):
@@ -228,22 +1618,29 @@ class Qualtrics:
                 survey_id = survey.id
             else:
                 return None
-        res = get_request(url='{}/survey-definitions/{}'.format(self.baseUrl, survey_id))
+        if self.metadataCache:
+            definition = self.metadataCache.load_item(self._metadataNamespace, 'survey_definitions', survey_id)
+            if definition is not None:
+                return definition
+        res = self.transport.get_request(url='{}/survey-definitions/{}'.format(self.baseUrl, survey_id))
         if res:
+            if self.metadataCache:
+                self.metadataCache.save_item(self._metadataNamespace, 'survey_definitions', survey_id,
+                                             res.json()['result'])
             return res.json()['result']
         return None
 
     def get_users(self, forceUpdate: bool = False, skipAPICalls: bool = False):
         if forceUpdate or not self.users:
-            time.sleep(1)  # have to wait for API server to catch up
-            users = []
-            res = get_request(url='{}/users'.format(self.baseUrl))
-            if res:
-                for user in res.json()['result']['elements']:
-                    users.append(User(data=user, qualtrics=self, skipAPICalls=False))
-            else:
+            failures = []
+            users = IndexedList([User(data=user, qualtrics=self, skipAPICalls=False)
+                                 for user in self.transport.iter_elements(url='{}/users'.format(self.baseUrl),
+                                                                          failures=failures)],
+                                id='id', username='username')
+            if failures:  # a page failed, keep whatever was there rather than a partial list
                 return None
             self.users = users
+            self._store_metadata('users')
         return self.users
 
     def get_user(self, user_id: str = None, user_username: str = None, forceUpdate: bool = False,
@@ -252,11 +1649,16 @@ class Qualtrics:
             return None
         users = self.get_users(forceUpdate=forceUpdate, skipAPICalls=skipAPICalls)
         if users:
-            for user in users:
-                if user_id and user_id == user.id:
-                    return user
-                if users and user_username == user.username:
-                    return user
+            return users.find('id', user_id) or users.find('username', user_username)
+        return None
+
+    def fetch_user(self, user_id: str, skipAPICalls: bool = False):
+        """
+        Download a single user, bypassing Qualtrics.users
+        """
+        res = self.transport.get_request(url='{}/users/{}'.format(self.baseUrl, user_id))
+        if res:
+            return User(data=res.json()['result'], qualtrics=self, skipAPICalls=skipAPICalls)
         return None
 
     def create_user(self,
@@ -285,34 +1687,38 @@ class Qualtrics:
             data['divisionId'] = divisionId
         if accountExpirationDate:
             data['accountExpirationDate'] = accountExpirationDate
-        res = post_request(url='{}/users'.format(self.baseUrl), payload=data)
+        res = self.transport.post_request(url='{}/users'.format(self.baseUrl), payload=data)
         if res:
-            self.get_users(forceUpdate=True, skipAPICalls=skipAPICalls)
-            if returnNewUser:
-                new_user_id = res.json()['result']['id']
-                return self.get_user(user_id=new_user_id, skipAPICalls=skipAPICalls)
+            if returnNewUser or self.users or self.metadataCache:
+                new_user = self.fetch_user(user_id=res.json()['result']['id'], skipAPICalls=skipAPICalls)
+                _store_changed(self, 'users', new_user)
+                if returnNewUser:
+                    return new_user
             return True
         if returnNewUser:
             return None
         return False
 
-    def get_mailing_lists(self, _carriedLists=None, _offset=0, forceUpdate: bool = False, skipAPICalls: bool = False):
+    def iter_mailing_lists(self, prefetch: int = 0, skipAPICalls: bool = False, failures: list = None):
+        """
+        Stream mailing lists from the API page by page. Does not use or update Qualtrics.mailing_lists
+        :param prefetch: Download up to this many upcoming pages concurrently. Optional
+        :param failures: Gets the response of a page that failed and cut the stream short. Optional
+        :return: generator of MailingList objects
+        """
+        for mailing_list in self.transport.iter_elements(url='{}/mailinglists'.format(self.baseUrl),
+                                                         offsetPaging=True, prefetch=prefetch, failures=failures):
+            yield MailingList(data=mailing_list, qualtrics=self, skipAPICalls=skipAPICalls)
+
+    def get_mailing_lists(self, forceUpdate: bool = False, prefetch: int = 0, skipAPICalls: bool = False):
         if forceUpdate or not self.mailing_lists:
-            time.sleep(1)  # have to wait for API server to catch up
-            lists = []
-            if _carriedLists:
-                lists = _carriedLists
-            res = get_request(
-                url='{}/mailinglists{}'.format(self.baseUrl, "?offset={}".format(_offset) if _offset > 0 else ""))
-            if res:
-                for mailing_list in res.json()['result']['elements']:
-                    lists.append(MailingList(data=mailing_list, qualtrics=self, skipAPICalls=skipAPICalls))
-                if res.json()['result'].get('nextPage'):
-                    lists = self.get_mailing_lists(_carriedLists=lists,
-                                                   _offset=_offset + int(res.json()['result'].get('nextPage')),
-                                                   forceUpdate=forceUpdate,
-                                                   skipAPICalls=skipAPICalls)
-            self.mailing_lists = lists
+            failures = []
+            mailing_lists = IndexedList(self.iter_mailing_lists(prefetch=prefetch, skipAPICalls=skipAPICalls,
+                                                                failures=failures), id='id', name='name')
+            if failures:  # a page failed, keep whatever was there rather than a partial list
+                return None
+            self.mailing_lists = mailing_lists
+            self._store_metadata('mailing_lists')
         return self.mailing_lists
 
     def get_mailing_list(self, list_id=None, list_name=None, forceUpdate: bool = False, skipAPICalls: bool = False):
@@ -320,56 +1726,158 @@ class Qualtrics:
             return None
         lists = self.get_mailing_lists(forceUpdate=forceUpdate, skipAPICalls=skipAPICalls)
         if lists:
-            for mailing_list in lists:
-                if list_id and list_id == mailing_list.id:
-                    return mailing_list
-                if list_name and list_name == mailing_list.name:
-                    return mailing_list
+            return lists.find('id', list_id) or lists.find('name', list_name)
+        return None
+
+    def fetch_mailing_list(self, list_id: str, skipAPICalls: bool = False):
+        """
+        Download a single mailing list, bypassing Qualtrics.mailing_lists
+        """
+        res = self.transport.get_request(url='{}/mailinglists/{}'.format(self.baseUrl, list_id))
+        if res:
+            return MailingList(data=res.json()['result'], qualtrics=self, skipAPICalls=skipAPICalls)
         return None
 
     def create_mailing_list(self, list_name: str, library_id: str, entries_to_add: dict = None,
                             list_category: str = None,
                             returnNewList: bool = True, skipAPICalls: bool = False):
+        """
+        Create a mailing list, optionally filling it through MailingList.import_contacts
+        :return: The new MailingList (its import summary in MailingList.importSummary) if returnNewList,
+        else the import summary if entries_to_add were given, else True. None/False if the list wasn't created
+        """
         data = {'libraryId': library_id,
                 'name': list_name}
         if list_category:
             data['category'] = list_category
-        res = post_request(url='{}/mailinglists'.format(self.baseUrl), payload=data)
+        res = self.transport.post_request(url='{}/mailinglists'.format(self.baseUrl), payload=data)
         if res:
             new_list_id = res.json()['result']['id']
-            self.get_mailing_lists(forceUpdate=True, skipAPICalls=skipAPICalls)
-            if returnNewList or entries_to_add:
-                new_list = self.get_mailing_list(list_id=new_list_id, skipAPICalls=skipAPICalls)
+            if returnNewList or entries_to_add or self.mailing_lists or self.metadataCache:
+                new_list = self.fetch_mailing_list(list_id=new_list_id, skipAPICalls=True)
+                if not new_list:  # the list exists server-side, so work from what we just sent
+                    new_list = MailingList(data=dict(data, id=new_list_id), qualtrics=self, skipAPICalls=True)
+                _store_changed(self, 'mailing_lists', new_list)
+                summary = None
                 if entries_to_add:
-                    for entry in entries_to_add:
-                        new_list.create_contact(entry_data=entry, returnNewContact=False, skipAPICalls=skipAPICalls)
+                    summary = new_list.import_contacts(contacts=entries_to_add)
+                    new_list.importSummary = summary
                 if returnNewList:
                     return new_list
+                if summary is not None:
+                    return summary
             return True
         if returnNewList:
             return None
         return False
 
-    def get_libraries(self, _carriedLibraries=None, _nextPageURL=None, forceUpdate: bool = False,
-                      skipAPICalls: bool = False):
+    def export_responses(self, surveys: list = None, max_concurrency: int = 10, folderName: str = None,
+                         fileFormat: str = 'csv', poll_interval: float = 1, max_poll_interval: float = 10,
+                         timeout: float = None, cancel_event: threading.Event = None, **exportOptions):
+        """
+        Export responses for many surveys at once. Up to max_concurrency export jobs run server-side together,
+        all outstanding jobs are polled in one loop and finished files are downloaded as soon as they are ready
+        :param surveys: Surveys to export. Defaults to every survey in Qualtrics.surveys
+        :param max_concurrency: Most export jobs (including downloads) in flight at once
+        :param folderName: Where to save the files. Defaults to each survey's response folder
+        :param fileFormat: Export file format
+        :param poll_interval: Seconds between rounds of progress checks, backing off up to max_poll_interval
+        :param max_poll_interval: Longest wait between rounds of progress checks
+        :param timeout: Give up on an export this many seconds after it started. Optional
+        :param cancel_event: threading.Event that stops the whole run when set. Optional
+        :param exportOptions: Passed to the export request, i.e. start_date, end_date, use_labels, question_ids
+        :return: {survey_id: path to the downloaded file, or the exception that stopped that export}
+        """
+        if surveys is None:
+            surveys = self.get_surveys() or []
+        waiting = collections.deque(surveys)
+        exporting = {}  # progressId: (survey, start time)
+        downloading = {}  # future: survey
+        results = {}
+        pool = ThreadPoolExecutor(max_workers=max_concurrency)
+        delays = _backoff_delays(initial=poll_interval, maximum=max_poll_interval, jitter=0.2)
+        try:
+            while waiting or exporting or downloading:
+                if cancel_event and cancel_event.is_set():
+                    for progressId, (survey, _) in exporting.items():
+                        results[survey.id] = ExportCancelled('export cancelled', progressId=progressId)
+                    for survey in waiting:
+                        results[survey.id] = ExportCancelled('export cancelled')
+                    waiting.clear()
+                    exporting.clear()
+                started = False
+                while waiting and len(exporting) + len(downloading) < max_concurrency:
+                    survey = waiting.popleft()
+                    if folderName:
+                        survey.responseFolder = folderName
+                    try:
+                        if not survey.responseFolder:
+                            raise Exception('No response folder assigned')
+                        progressId = survey._start_export(fileFormat=fileFormat, **exportOptions)
+                    except Exception as e:
+                        results[survey.id] = e
+                        continue
+                    exporting[progressId] = (survey, time.monotonic())
+                    started = True
+                if started:  # check new jobs soon
+                    delays = _backoff_delays(initial=poll_interval, maximum=max_poll_interval, jitter=0.2)
+                for progressId, (survey, startedAt) in list(exporting.items()):
+                    try:
+                        try:
+                            result = survey._check_export(progressId=progressId)
+                        except requests.RequestException as e:  # network blip, check again next round
+                            logging.warning("Checking on export {} failed: {}".format(progressId, e))
+                            result = None
+                        if not result and timeout is not None and time.monotonic() - startedAt >= timeout:
+                            raise ExportTimeout('export not complete after {} seconds'.format(timeout),
+                                                progressId=progressId)
+                    except Exception as e:  # one bad survey mustn't throw away the rest of the run
+                        results[survey.id] = e
+                        del exporting[progressId]
+                        continue
+                    if result:
+                        del exporting[progressId]
+                        downloading[pool.submit(survey._download_export_file,
+                                                url=survey._export_file_url(result['fileId']),
+                                                fileFormat=fileFormat)] = survey
+                if waiting and len(exporting) + len(downloading) < max_concurrency:
+                    continue
+                delay = next(delays) if exporting else None
+                if downloading:
+                    done, _ = wait(downloading, timeout=delay, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        survey = downloading.pop(future)
+                        try:
+                            results[survey.id] = future.result()
+                            survey.responses = IndexedList(id='id')  # parsed again from the new file on demand
+                            survey.responseDataframe = None
+                        except Exception as e:
+                            results[survey.id] = e
+                elif delay:
+                    time.sleep(delay)
+        finally:
+            pool.shutdown(wait=True)
+        return results
+
+    def iter_libraries(self, skipAPICalls: bool = False, failures: list = None):
+        """
+        Stream libraries from the API page by page. Does not use or update Qualtrics.libraries
+        :param failures: Gets the response of a page that failed and cut the stream short. Optional
+        :return: generator of Library objects
+        """
+        for library in self.transport.iter_elements(url='{baseUrl}/libraries'.format(baseUrl=self.baseUrl),
+                                                    failures=failures):
+            yield Library(data=library, qualtrics=self, skipAPICalls=skipAPICalls)
+
+    def get_libraries(self, forceUpdate: bool = False, skipAPICalls: bool = False):
         if forceUpdate or not self.libraries:
-            time.sleep(1)  # have to wait for API server to catch up
-            libraries = []
-            if _carriedLibraries:
-                libraries = _carriedLibraries
-            url = '{baseUrl}/libraries'.format(baseUrl=self.baseUrl)
-            if _nextPageURL:
-                url = _nextPageURL
-            res = get_request(url=url)
-            if res:
-                for library in res.json()['result']['elements']:
-                    libraries.append(Library(data=library, qualtrics=self, skipAPICalls=skipAPICalls))
-                if res.json()['result'].get('nextPage'):
-                    libraries = self.get_libraries(_carriedLibraries=libraries,
-                                                   _nextPageURL=res.json()['result'].get('nextPage'),
-                                                   forceUpdate=forceUpdate,
-                                                   skipAPICalls=skipAPICalls)
+            failures = []
+            libraries = IndexedList(self.iter_libraries(skipAPICalls=skipAPICalls, failures=failures),
+                                    id='id', name='name')
+            if failures:  # a page failed, keep whatever was there rather than a partial list
+                return None
             self.libraries = libraries
+            self._store_metadata('libraries')
         return self.libraries
 
     def get_library(self, library_name: str = None, library_id: str = None, forceUpdate: bool = False,
@@ -378,11 +1886,7 @@ class Qualtrics:
             return None
         libraries = self.get_libraries(forceUpdate=forceUpdate, skipAPICalls=skipAPICalls)
         if libraries:
-            for library in libraries:
-                if library_id and library_id == library.id:
-                    return library
-                if library_name and library_name == library.name:
-                    return library
+            return libraries.find('id', library_id) or libraries.find('name', library_name)
         return None
 
 
@@ -432,7 +1936,7 @@ class Division:
                 data[varname] = var
         if permissions:
             data['permissions'] = permissions.data
-        res = put_request('{baseUrl}/divisions/{d_id}'.format(baseUrl=self.qualtrics.baseUrl, d_id=self.id),
+        res = self.qualtrics.transport.put_request('{baseUrl}/divisions/{d_id}'.format(baseUrl=self.qualtrics.baseUrl, d_id=self.id),
                           payload=data)
         if res:
             if returnNewDivision:
@@ -449,32 +1953,23 @@ class Library:
         self.qualtrics = qualtrics
         self.id = data.get('libraryId')
         self.name = data.get('libraryName')
-        self.surveys = []
+        self.surveys = IndexedList(id='id', name='name')
         if not skipAPICalls:
             self.get_surveys()
 
-    def get_surveys(self, _carriedSurveys=None, _nextPageURL=None, forceUpdate: bool = False,
-                    skipAPICalls: bool = False):
+    def iter_surveys(self, skipAPICalls: bool = False):
+        """
+        Stream this library's surveys from the API page by page. Does not use or update Library.surveys
+        :return: generator of Survey objects
+        """
+        url = '{baseUrl}/libraries/{l_id}/survey/surveys'.format(baseUrl=self.qualtrics.baseUrl, l_id=self.id)
+        for survey in self.qualtrics.transport.iter_elements(url=url):
+            yield Survey(data=survey, qualtrics=self.qualtrics, responseFolder=self.qualtrics.responseFolder,
+                         skipAPICalls=skipAPICalls)
+
+    def get_surveys(self, forceUpdate: bool = False, skipAPICalls: bool = False):
         if forceUpdate or not self.surveys:
-            time.sleep(1)  # have to wait for API server to catch up
-            surveys = []
-            if _carriedSurveys:
-                surveys = _carriedSurveys
-            url = '{baseUrl}/libraries/{l_id}/survey/surveys'.format(baseUrl=self.qualtrics.baseUrl, l_id=self.id)
-            if _nextPageURL:
-                url = _nextPageURL
-            res = get_request(url=url)
-            if res:
-                for survey in res.json()['result']['elements']:
-                    surveys.append(
-                        Survey(data=survey, qualtrics=self.qualtrics, responseFolder=self.qualtrics.responseFolder,
-                               skipAPICalls=skipAPICalls))
-                if res.json()['result'].get('nextPage'):
-                    surveys = self.get_surveys(_carriedSurveys=surveys,
-                                               _nextPageURL=res.json()['result'].get('nextPage'),
-                                               forceUpdate=forceUpdate,
-                                               skipAPICalls=skipAPICalls)
-            self.surveys = surveys
+            self.surveys = IndexedList(self.iter_surveys(skipAPICalls=skipAPICalls), id='id', name='name')
         return self.surveys
 
     def get_survey(self, survey_id=None, survey_name=None, forceUpdate: bool = False, skipAPICalls: bool = False):
@@ -482,11 +1977,7 @@ class Library:
             return None
         surveys = self.get_surveys(forceUpdate=forceUpdate, skipAPICalls=skipAPICalls)
         if surveys:
-            for survey in surveys:
-                if survey_id and survey_id == survey.id:
-                    return survey
-                if survey_name and survey_name == survey.name:
-                    return survey
+            return surveys.find('id', survey_id) or surveys.find('name', survey_name)
         return None
 
 
@@ -499,7 +1990,8 @@ class MailingList:
         self.name = data.get('name')
         self.category = data.get('category')
         self.folder = data.get('folder')
-        self.contacts = []
+        self.contacts = IndexedList(id='id', name=('firstName', 'lastName'))
+        self.importSummary = None
         if not skipAPICalls:
             self.get_contacts()
 
@@ -517,64 +2009,115 @@ class MailingList:
         ]:
             if var:
                 data[varname] = var
-        res = put_request('{baseUrl}/mailinglists/{list_id}'.format(baseUrl=self.qualtrics.baseUrl, list_id=self.id),
+        res = self.qualtrics.transport.put_request('{baseUrl}/mailinglists/{list_id}'.format(baseUrl=self.qualtrics.baseUrl, list_id=self.id),
                           payload=data)
         if res:
-            self.qualtrics.get_mailing_lists(forceUpdate=True, skipAPICalls=skipAPICalls)
-            if returnNewList:
-                return self.qualtrics.get_mailing_list(list_id=self.id, skipAPICalls=skipAPICalls)
+            if returnNewList or self.qualtrics.mailing_lists or self.qualtrics.metadataCache:
+                new_list = self.qualtrics.fetch_mailing_list(list_id=self.id, skipAPICalls=skipAPICalls)
+                _store_changed(self.qualtrics, 'mailing_lists', new_list)
+                if returnNewList:
+                    return new_list
             return True
         if returnNewList:
             return None
         return False
 
     def delete(self, skipAPICalls: bool = False):
-        res = delete_request(url=
+        res = self.qualtrics.transport.delete_request(url=
                              '{baseUrl}/mailinglists/{list_id}/'.format(baseUrl=self.qualtrics.baseUrl,
                                                                         list_id=self.id))
         if res:
-            self.qualtrics.get_mailing_lists(forceUpdate=True, skipAPICalls=skipAPICalls)
+            _store_removed(self.qualtrics, 'mailing_lists', self.id)
             return True
         return False
 
-    def get_contacts(self, _carriedContacts=None, _nextPageURL=None, forceUpdate: bool = False,
-                     skipAPICalls: bool = False):
+    def iter_contacts(self, skipAPICalls: bool = False):
+        """
+        Stream this list's contacts from the API page by page. Does not use or update MailingList.contacts
+        :return: generator of Contact objects
+        """
+        url = '{baseUrl}/mailinglists/{list_id}/contacts'.format(baseUrl=self.qualtrics.baseUrl, list_id=self.id)
+        for contact in self.qualtrics.transport.iter_elements(url=url):
+            yield Contact(data=contact, mailingList=self, qualtrics=self.qualtrics, skipAPICalls=skipAPICalls)
+
+    def get_contacts(self, forceUpdate: bool = False, skipAPICalls: bool = False):
         if forceUpdate or not self.contacts:
-            time.sleep(1)  # have to wait for API server to catch up
-            contacts = []
-            if _carriedContacts:
-                contacts = _carriedContacts
-            url = '{baseUrl}/mailinglists/{list_id}/contacts'.format(baseUrl=self.qualtrics.baseUrl, list_id=self.id)
-            if _nextPageURL:
-                url = _nextPageURL
-            res = get_request(url=url)
-            if res:
-                for contact in res.json()['result']['elements']:
-                    contacts.append(
-                        Contact(data=contact, mailingList=self, qualtrics=self.qualtrics, skipAPICalls=skipAPICalls))
-                if res.json()['result'].get('nextPage'):
-                    contacts = self.get_contacts(_carriedContacts=contacts,
-                                                 _nextPageURL=res.json()['result'].get('nextPage'),
-                                                 forceUpdate=forceUpdate,
-                                                 skipAPICalls=skipAPICalls)
-            self.contacts = contacts
+            self.contacts = IndexedList(self.iter_contacts(skipAPICalls=skipAPICalls),
+                                        id='id', name=('firstName', 'lastName'))
         return self.contacts
 
     def get_contact(self, contact_name: dict = None, contact_id: str = None, forceUpdate: bool = False,
                     skipAPICalls: bool = False):
         if not contact_name and not contact_id:
             return None
-        for k in ['firstName', 'lastName']:
-            if k not in contact_name.keys():
-                return None
+        name = None
+        if contact_name:
+            for k in ['firstName', 'lastName']:
+                if k not in contact_name.keys():
+                    return None
+            name = (contact_name['firstName'], contact_name['lastName'])
         contacts = self.get_contacts(forceUpdate=forceUpdate, skipAPICalls=skipAPICalls)
         if contacts:
-            for contact in contacts:
-                if contact_id and contact_id == contact.id:
-                    return contact
-                if contact_name and contact_name['firstName'] == contact.firstName and contact_name[
-                    'lastName'] == contact.lastName:
-                    return contact
+            return contacts.find('id', contact_id) or contacts.find('name', name)
+        return None
+
+    def import_contacts(self, contacts, batchSize: int = 5000, pollInterval: float = 0.5,
+                        maxPollInterval: float = 10, timeout: float = 600):
+        """
+        Add many contacts through Qualtrics' bulk contact import jobs rather than one POST per contact
+        :param contacts: Iterable of contact dicts, a pandas DataFrame or the path to a CSV file.
+        Columns other than the standard contact fields are imported as embedded data
+        :param batchSize: Contacts sent per import job
+        :param pollInterval: Seconds to wait before first checking on a job. Doubles on every check
+        :param maxPollInterval: Longest wait between job checks
+        :param timeout: Stop waiting on a job after this many seconds and record it as 'timedOut'. None waits forever
+        :return: {'added': int, 'updated': int, 'failed': int, 'jobs': [{'id': str, 'status': str, ...}, ...]}
+        """
+        summary = {'added': 0, 'updated': 0, 'failed': 0, 'jobs': []}
+        batch = []
+        for row in _iter_contact_rows(contacts):
+            batch.append(_contact_entry(row))
+            if len(batch) >= batchSize:
+                self._run_contact_import(batch, summary, pollInterval, maxPollInterval, timeout)
+                batch = []
+        if batch:
+            self._run_contact_import(batch, summary, pollInterval, maxPollInterval, timeout)
+        if summary['jobs']:  # cached contacts are stale now
+            self.contacts = IndexedList(id='id', name=('firstName', 'lastName'))
+        return summary
+
+    def _run_contact_import(self, batch, summary, pollInterval, maxPollInterval, timeout):
+        importsUrl = '{baseUrl}/mailinglists/{list_id}/contactimports'.format(baseUrl=self.qualtrics.baseUrl,
+                                                                             list_id=self.id)
+        res = self.qualtrics.transport.post_request(url=importsUrl, payload={'contacts': batch})
+        if not res:
+            logging.error("Contact import failed to start: {}".format(res.text))
+            summary['failed'] += len(batch)
+            summary['jobs'].append({'id': None, 'status': 'failed', 'contacts': len(batch)})
+            return
+        importId = res.json()['result']['id']
+        status, result = _poll_job(self.qualtrics.transport, url='{}/{}'.format(importsUrl, importId),
+                                   description='Contact import {}'.format(importId), pollInterval=pollInterval,
+                                   maxPollInterval=maxPollInterval, timeout=timeout)
+        if status == 'timedOut':
+            logging.error("Contact import {} did not finish within {}s".format(importId, timeout))
+        counts = result.get('contacts', {}).get('count', {})
+        if status != 'complete' and not counts:
+            counts = {'failed': len(batch)}
+        for k in ['added', 'updated', 'failed']:
+            summary[k] += counts.get(k, 0)
+        summary['jobs'].append({'id': importId, 'status': status, 'contacts': len(batch), 'count': counts})
+
+    def fetch_contact(self, contact_id: str, skipAPICalls: bool = False):
+        """
+        Download a single contact, bypassing MailingList.contacts
+        """
+        res = self.qualtrics.transport.get_request(
+            url='{baseUrl}/mailinglists/{list_id}/contacts/{c_id}'.format(baseUrl=self.qualtrics.baseUrl,
+                                                                        list_id=self.id, c_id=contact_id))
+        if res:
+            return Contact(data=res.json()['result'], mailingList=self, qualtrics=self.qualtrics,
+                           skipAPICalls=skipAPICalls)
         return None
 
     def create_contact(self,
@@ -602,19 +2145,65 @@ class MailingList:
                     entry_data[varname] = var
             if unsubscribed is not None:
                 entry_data['unsubscribed'] = unsubscribed
-        res = post_request(
+        res = self.qualtrics.transport.post_request(
             '{baseUrl}/mailinglists/{list_id}/contacts'.format(baseUrl=self.qualtrics.baseUrl, list_id=self.id),
             payload=entry_data)
         if res:
-            self.get_contacts(forceUpdate=True, skipAPICalls=skipAPICalls)
+            new_contact_id = res.json()['result']['id']
+            if returnNewContact:
+                new_contact = self.fetch_contact(contact_id=new_contact_id, skipAPICalls=skipAPICalls)
+            else:  # no need to ask the API for what we just sent it
+                new_contact = Contact(data=dict(entry_data, id=new_contact_id), mailingList=self,
+                                      qualtrics=self.qualtrics, skipAPICalls=skipAPICalls)
+            if new_contact and self.contacts:
+                self.contacts.upsert(new_contact)
             if returnNewContact:
-                return self.get_contact(contact_id=res.json()['result']['id'], skipAPICalls=skipAPICalls)
+                return new_contact
             return True
         if returnNewContact:
             return None
         return False
 
 
+CONTACT_FIELDS = ['firstName', 'lastName', 'email', 'phone', 'extRef', 'externalDataRef', 'language', 'unsubscribed']
+
+
+def _contact_entry(row: dict):
+    # turn a flat row (CSV/DataFrame) into an import entry, extra columns become embedded data
+    entry = {}
+    embeddedData = dict(row.get('embeddedData') or {})
+    for k, v in row.items():
+        if k == 'embeddedData' or v is None or v == '' or (isinstance(v, float) and pd.isna(v)):
+            continue
+        if k == 'unsubscribed':
+            entry[k] = _to_bool(v)
+        elif k in CONTACT_FIELDS:
+            entry[k] = v
+        else:
+            embeddedData[k] = v
+    if embeddedData:
+        entry['embeddedData'] = embeddedData
+    return entry
+
+
+def _to_bool(value):
+    # CSV cells arrive as text, so 'false' and '0' mustn't count as truthy strings
+    if isinstance(value, str):
+        return value.strip().lower() in ['true', 't', 'yes', 'y', '1']
+    return bool(value)
+
+
+def _iter_contact_rows(contacts):
+    if isinstance(contacts, str):
+        with open(contacts, newline='') as f:
+            yield from csv.DictReader(f)
+    elif isinstance(contacts, pd.DataFrame):
+        for row in contacts.to_dict('records'):
+            yield row
+    else:
+        yield from contacts
+
+
 class Contact:
     def __init__(self, data, mailingList: MailingList, qualtrics: Qualtrics, skipAPICalls: bool = False):
         self.data = data
@@ -654,26 +2243,29 @@ class Contact:
                 data[varname] = var
         if unsubscribed is not None:
             data['unsubscribed'] = unsubscribed
-        res = put_request(url='{baseUrl}/mailinglists/{list_id}/contacts/{c_id}'.format(baseUrl=self.qualtrics.baseUrl,
+        res = self.qualtrics.transport.put_request(url='{baseUrl}/mailinglists/{list_id}/contacts/{c_id}'.format(baseUrl=self.qualtrics.baseUrl,
                                                                                         list_id=self.mailingList.id,
                                                                                         c_id=self.id),
                           payload=data)
         if res:
-            self.mailingList.get_contacts(forceUpdate=True, skipAPICalls=skipAPICalls)
-            if returnNewContact:
-                return self.mailingList.get_contact(contact_id=self.id, skipAPICalls=skipAPICalls)
+            if returnNewContact or self.mailingList.contacts:
+                new_contact = self.mailingList.fetch_contact(contact_id=self.id, skipAPICalls=skipAPICalls)
+                if new_contact and self.mailingList.contacts:
+                    self.mailingList.contacts.upsert(new_contact)
+                if returnNewContact:
+                    return new_contact
             return True
         if returnNewContact:
             return None
         return False
 
     def delete(self, skipAPICalls: bool = False):
-        res = delete_request(
+        res = self.qualtrics.transport.delete_request(
             url='{baseUrl}/mailinglists/{list_id}/contacts/{c_id}'.format(baseUrl=self.qualtrics.baseUrl,
                                                                           list_id=self.mailingList.id,
                                                                           c_id=self.id))
         if res:
-            self.mailingList.get_contacts(forceUpdate=True, skipAPICalls=skipAPICalls)
+            self.mailingList.contacts.discard('id', self.id)
             return True
         return False
 
@@ -744,33 +2336,37 @@ class User:
                 data[varname] = var
         if permissions:
             data['permissions'] = self._construct_permissions_dict(permissionSet=permissions)
-        res = put_request(self.qualtrics.baseUrl, payload=data)
+        res = self.qualtrics.transport.put_request('{baseUrl}/users/{u_id}'.format(baseUrl=self.qualtrics.baseUrl,
+                                                                                  u_id=self.id),
+                                                   payload=data)
         if res:
-            self.qualtrics.get_users(forceUpdate=True, skipAPICalls=skipAPICalls)
-            if returnNewUser:
-                return self.qualtrics.get_user(user_id=self.id, skipAPICalls=skipAPICalls)
+            if returnNewUser or self.qualtrics.users or self.qualtrics.metadataCache:
+                new_user = self.qualtrics.fetch_user(user_id=self.id, skipAPICalls=skipAPICalls)
+                _store_changed(self.qualtrics, 'users', new_user)
+                if returnNewUser:
+                    return new_user
             return True
         if returnNewUser:
             return None
         return False
 
     def delete(self, skipAPICalls: bool = False):
-        res = delete_request(url=
+        res = self.qualtrics.transport.delete_request(url=
                              '{baseUrl}/users/{u_id}'.format(baseUrl=self.qualtrics.baseUrl, u_id=self.id))
         if res:
-            self.qualtrics.get_users(forceUpdate=True, skipAPICalls=skipAPICalls)
+            _store_removed(self.qualtrics, 'users', self.id)
             return True
         return False
 
     def get_api_token(self, skipAPICalls: bool = False):
-        res = get_request(
+        res = self.qualtrics.transport.get_request(
             url='{baseUrl}/users/{id}/apitoken'.format(baseUrl=self.qualtrics.baseUrl, id=self.id))
         if res:
             return res.json()['result']['apiToken']
         return None
 
     def create_api_token(self, skipAPICalls: bool = False):
-        res = post_request(
+        res = self.qualtrics.transport.post_request(
             url='{baseUrl}/users/{id}/apitoken'.format(baseUrl=self.qualtrics.baseUrl, id=self.id))
         if res:
             return res.json()['result']['apiToken']
@@ -798,22 +2394,24 @@ class Group:
         ]:
             if var:
                 data[varname] = var
-        res = put_request('{baseUrl}/groups/{g_id}'.format(baseUrl=self.qualtrics.baseUrl, g_id=self.id),
+        res = self.qualtrics.transport.put_request('{baseUrl}/groups/{g_id}'.format(baseUrl=self.qualtrics.baseUrl, g_id=self.id),
                           payload=data)
         if res:
-            self.qualtrics.get_groups(forceUpdate=True, skipAPICalls=skipAPICalls)
-            if returnNewGroup:
-                return self.qualtrics.get_group(group_id=self.id, skipAPICalls=skipAPICalls)
+            if returnNewGroup or self.qualtrics.groups or self.qualtrics.metadataCache:
+                new_group = self.qualtrics.fetch_group(group_id=self.id, skipAPICalls=skipAPICalls)
+                _store_changed(self.qualtrics, 'groups', new_group)
+                if returnNewGroup:
+                    return new_group
             return True
         if returnNewGroup:
             return None
         return False
 
     def delete(self, skipAPICalls: bool = False):
-        res = delete_request(url=
+        res = self.qualtrics.transport.delete_request(url=
                              '{baseUrl}/groups/{g_id}'.format(baseUrl=self.qualtrics.baseUrl, g_id=self.id))
         if res:
-            self.qualtrics.get_groups(forceUpdate=True, skipAPICalls=skipAPICalls)
+            _store_removed(self.qualtrics, 'groups', self.id)
             return True
         return False
 
@@ -823,7 +2421,7 @@ class Group:
         data = {'userId': user_id}
         if user:
             data['userId'] = user.id
-        res = post_request(url=
+        res = self.qualtrics.transport.post_request(url=
                            '{baseUrl}/groups/{g_id}/members'.format(baseUrl=self.qualtrics.baseUrl, g_id=self.id),
                            payload=data)
         if res:
@@ -835,7 +2433,7 @@ class Group:
             return False
         if user:
             user_id = user.id
-        res = delete_request(url=
+        res = self.qualtrics.transport.delete_request(url=
                              '{baseUrl}/groups/{g_id}/members/{u_id}'.format(baseUrl=self.qualtrics.baseUrl,
                                                                              g_id=self.id, u_id=user_id))
         if res:
@@ -854,6 +2452,187 @@ class Choice:
             self.image = Image(data.get('Image'))
 
 
+class Filter:
+    def __init__(self, filter=None, skipAPICalls: bool = False):
+        """
+        Saved response filter, {'FieldName1': ['Value1', 'Value2'], 'FieldName2': ['Value1']}.
+        Filters combine with & (and), | (or) and ~ (not), i.e. InFilter('Q1', ['1']) & RangeFilter('RecordedDate', start=...)
+        """
+        self.filter = filter
+
+    def mask(self, responses: ResponseList):
+        """
+        :param responses: Parsed responses to evaluate against
+        :return: boolean pandas Series, one entry per response
+        """
+        mask = pd.Series(True, index=responses.rows.index)
+        for field, values in (self.filter or {}).items():
+            mask &= _text_mask(responses.column(field), values)
+        return mask
+
+    def columns(self):
+        """
+        :return: the export columns this filter reads
+        """
+        return list(self.filter or {})
+
+    def export_options(self):
+        """
+        :return: export parameters (start_date/end_date) that narrow the export without losing any matching response
+        """
+        return {}
+
+    def __and__(self, other):
+        return AndFilter(self, other)
+
+    def __or__(self, other):
+        return OrFilter(self, other)
+
+    def __invert__(self):
+        return NotFilter(self)
+
+
+class InFilter(Filter):
+    def __init__(self, column: str, values):
+        """
+        Responses whose value in column is one of values
+        """
+        super().__init__({column: list(values)})
+        self.column = column
+        self.values = list(values)
+
+
+class EqualsFilter(InFilter):
+    def __init__(self, column: str, value):
+        """
+        Responses whose value in column equals value
+        """
+        super().__init__(column, [value])
+
+
+class RangeFilter(Filter):
+    def __init__(self, column: str, start=None, end=None, inclusive: bool = True):
+        """
+        Responses whose value in column lies between start and end. Numbers are compared as numbers, anything else
+        as dates. A RecordedDate range is pushed down to the export's startDate/endDate, widened to cover any time zone
+        :param start: Lower bound. Optional
+        :param end: Upper bound. Optional
+        :param inclusive: Include the bounds themselves
+        """
+        if start is None and end is None:
+            raise Exception("RangeFilter needs a start and/or an end")
+        super().__init__()
+        self.column = column
+        self.start = start
+        self.end = end
+        self.inclusive = inclusive
+        self.numeric = all(isinstance(bound, (int, float)) for bound in [start, end] if bound is not None)
+
+    def mask(self, responses: ResponseList):
+        if self.numeric:
+            values, start, end = pd.to_numeric(responses.column(self.column), errors='coerce'), self.start, self.end
+        else:
+            values = responses.dates(self.column)
+            start = _timestamp(self.start) if self.start is not None else None
+            end = _timestamp(self.end) if self.end is not None else None
+        mask = pd.Series(True, index=responses.rows.index)
+        if start is not None:
+            mask &= values >= start if self.inclusive else values > start
+        if end is not None:
+            mask &= values <= end if self.inclusive else values < end
+        return mask
+
+    def columns(self):
+        return [self.column]
+
+    def export_options(self):
+        if self.numeric or self.column != 'RecordedDate':
+            return {}
+        # startDate/endDate are UTC, but the local mask compares dates as exported, in the organization's (or
+        # time_zone's) time, which can be up to 14 hours either side of UTC. Widen the bounds by that much so the
+        # export never leaves out a response the local filter would keep; the local filter still decides
+        margin = pd.Timedelta(hours=14)
+        options = {}
+        if self.start is not None:
+            options['start_date'] = (_timestamp(self.start) - margin).strftime('%Y-%m-%dT%H:%M:%SZ')
+        if self.end is not None:  # the export's endDate is exclusive as well
+            options['end_date'] = (_timestamp(self.end) + margin + pd.Timedelta(seconds=1)).strftime(
+                '%Y-%m-%dT%H:%M:%SZ')
+        return options
+
+
+class _CompositeFilter(Filter):
+    def __init__(self, *filters: Filter):
+        super().__init__()
+        self.filters = list(filters)
+
+    def columns(self):
+        return list(dict.fromkeys(column for filter in self.filters for column in filter.columns()))
+
+
+class AndFilter(_CompositeFilter):
+    def __init__(self, *filters: Filter):
+        """
+        Responses matching every one of filters
+        """
+        super().__init__(*filters)
+
+    def mask(self, responses: ResponseList):
+        mask = pd.Series(True, index=responses.rows.index)
+        for filter in self.filters:
+            mask &= filter.mask(responses)
+        return mask
+
+    def export_options(self):
+        # tightest bounds of any part
+        options = {}
+        for filter in self.filters:
+            for key, value in filter.export_options().items():
+                if key not in options:
+                    options[key] = value
+                else:
+                    options[key] = max(options[key], value) if key == 'start_date' else min(options[key], value)
+        return options
+
+
+class OrFilter(_CompositeFilter):
+    def __init__(self, *filters: Filter):
+        """
+        Responses matching at least one of filters
+        """
+        super().__init__(*filters)
+
+    def mask(self, responses: ResponseList):
+        mask = pd.Series(False, index=responses.rows.index)
+        for filter in self.filters:
+            mask |= filter.mask(responses)
+        return mask
+
+    def export_options(self):
+        # loosest bounds, and only where every part is bounded
+        parts = [filter.export_options() for filter in self.filters]
+        options = {}
+        for key, widest in [('start_date', min), ('end_date', max)]:
+            if parts and all(key in part for part in parts):
+                options[key] = widest(part[key] for part in parts)
+        return options
+
+
+class NotFilter(Filter):
+    def __init__(self, filter: Filter):
+        """
+        Responses not matching filter
+        """
+        super().__init__()
+        self.negated = filter
+
+    def mask(self, responses: ResponseList):
+        return ~self.negated.mask(responses)
+
+    def columns(self):
+        return self.negated.columns()
+
+
 class Survey:
     def __init__(self, data, qualtrics: Qualtrics, responseFolder, responseFile: str = None,
                  skipAPICalls: bool = False):
@@ -861,9 +2640,10 @@ class Survey:
         self.qualtrics = qualtrics
         self.id = data.get('id')
         self.name = data.get('name')
-        self.owner = data.get('ownerId')
-        if self.owner and not skipAPICalls:
-            self.owner = qualtrics.get_user(user_id=self.owner)
+        # questions, quotas, flow and owner are fetched on first access (unless skipAPICalls), see prefetch()
+        self._lazy = not skipAPICalls
+        self._loaded = set()
+        self._owner = data.get('ownerId')
         self.organizationId = data.get('organizationId')
         self.active = data.get('isActive')
         self.creationDate = data.get('creationDate')
@@ -871,17 +2651,125 @@ class Survey:
         self.expiration = data.get('expiration')
         self.responseFolder = responseFolder
         self.responsesFile = responseFile
-        self.questions = []
-        self.responses = []
-        self.quotas = []
-        self.flow = None
+        self._questions = IndexedList(id='id', text='text')
+        self.responses = IndexedList(id='id')
+        self.responseDataframe = None  # built from the parsed responses on first access
+        self._quotas = IndexedList(id='id', name='name')
+        self._flow = None
         if self.responsesFile and not skipAPICalls:
             self.get_responses()
-        if not skipAPICalls:
-            self.get_questions()
-            self.get_quotas()
-            self.get_flow()
-        self.responseDataframe = self._create_responses_dataframe()
+
+    def _load_once(self, resource, load):
+        # the setters below mark a resource loaded, which load() only reaches when its request succeeded,
+        # so a failed request is tried again on the next access
+        if self._lazy and resource not in self._loaded:
+            load()
+
+    @property
+    def owner(self):
+        # User once resolved, the owner id with skipAPICalls (or if the user can't be looked up)
+        self._load_once('owner', self._resolve_owner)
+        return self._owner
+
+    @owner.setter
+    def owner(self, owner):
+        self._loaded.add('owner')
+        self._owner = owner
+
+    @property
+    def questions(self):
+        self._load_once('questions', self.get_questions)
+        return self._questions
+
+    @questions.setter
+    def questions(self, questions):
+        self._loaded.add('questions')
+        self._questions = questions
+
+    @property
+    def quotas(self):
+        self._load_once('quotas', self.get_quotas)
+        return self._quotas
+
+    @quotas.setter
+    def quotas(self, quotas):
+        self._loaded.add('quotas')
+        self._quotas = quotas
+
+    @property
+    def flow(self):
+        self._load_once('flow', self.get_flow)
+        return self._flow
+
+    @flow.setter
+    def flow(self, flow):
+        self._loaded.add('flow')
+        self._flow = flow
+
+    def prefetch(self, *resources, forceUpdate: bool = False, max_workers: int = 4):
+        """
+        Fetch the survey's sub-resources now, concurrently, instead of on first access
+        :param resources: Any of 'questions', 'quotas', 'flow', 'owner'. Defaults to all of them
+        :param forceUpdate: Fetch again even if already loaded
+        :param max_workers: Requests in flight at once
+        :return: self
+        """
+        loaders = {
+            'questions': lambda: self.get_questions(forceUpdate=forceUpdate),
+            'quotas': lambda: self.get_quotas(forceUpdate=forceUpdate),
+            'flow': lambda: self.get_flow(forceUpdate=forceUpdate),
+            'owner': self._resolve_owner,
+        }
+        resources = resources or tuple(loaders)
+        for resource in resources:
+            if resource not in loaders:
+                raise Exception("'{}' is not a survey resource to prefetch".format(resource))
+        resources = [resource for resource in resources if forceUpdate or resource not in self._loaded]
+        if len(resources) == 1 or max_workers <= 1:
+            for resource in resources:
+                loaders[resource]()
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                for future in [pool.submit(loaders[resource]) for resource in resources]:
+                    future.result()
+        return self
+
+    def _find_user(self, user_id):
+        return self._lookup_user(user_id)[0]
+
+    def _lookup_user(self, user_id):
+        # (User or None, whether asking again could help). One request instead of get_user's whole user list, over
+        # the sync transport on AsyncQualtrics too. A 4xx (deleted user, no permission) won't change on a retry
+        if self.qualtrics.users:
+            user = self.qualtrics.users.find('id', user_id)
+            if user:
+                return user, False
+        res = self.qualtrics.transport.get_request(url='{}/users/{}'.format(self.qualtrics.baseUrl, user_id))
+        if res:
+            return User(data=res.json()['result'], qualtrics=self.qualtrics), False
+        return None, res.status_code >= 500
+
+    def _resolve_owner(self):
+        # a network error raises out of here and leaves the owner unloaded, so it is tried again like a 5xx
+        ownerId = self._owner.id if isinstance(self._owner, User) else self._owner
+        if not ownerId:
+            self._loaded.add('owner')  # nothing to look up
+            return
+        owner, retry = self._lookup_user(ownerId)
+        if owner:
+            self.owner = owner
+        elif not retry:
+            self.owner = ownerId  # can't be looked up with this token, stays the id
+
+    @property
+    def responseDataframe(self):
+        if self._responseDataframe is None and self.responsesFile:
+            self._create_responses_dataframe()
+        return self._responseDataframe
+
+    @responseDataframe.setter
+    def responseDataframe(self, frame):
+        self._responseDataframe = frame
 
     def _export_survey(self,
                        fileFormat,
@@ -899,19 +2787,74 @@ class Survey:
                        question_ids=None,
                        embedded_data_ids=None,
                        survey_metadata_ids=None,
-                       compress=None):
+                       compress=None,
+                       on_progress=None,
+                       chunk_size=1024 * 1024,
+                       poll_interval=0.5,
+                       max_poll_interval=10,
+                       timeout=None,
+                       cancel_event: threading.Event = None):
         if not folderName and not self.responseFolder:
             raise Exception('No response folder assigned')
         if not folderName:
             folderName = self.responseFolder
         self.responseFolder = folderName
-        downloadStatus = "inProgress"
 
-        # create request headers and data
-        header = {
-            "content-type": "application/json",
-            "x-api-token": self.qualtrics.token,
-        }
+        # export responses server-side
+        progressId = self._start_export(fileFormat=fileFormat,
+                                        start_date=start_date,
+                                        end_date=end_date,
+                                        limit=limit,
+                                        use_labels=use_labels,
+                                        seen_unanswered_recode=seen_unanswered_recode,
+                                        multiselect_seen_unanswered_recode=multiselect_seen_unanswered_recode,
+                                        include_display_order=include_display_order,
+                                        format_decimal_as_comma=format_decimal_as_comma,
+                                        time_zone=time_zone,
+                                        newline_replacement=newline_replacement,
+                                        question_ids=question_ids,
+                                        embedded_data_ids=embedded_data_ids,
+                                        survey_metadata_ids=survey_metadata_ids,
+                                        compress=compress)
+        result = self._wait_for_export(progressId=progressId, poll_interval=poll_interval,
+                                       max_poll_interval=max_poll_interval, timeout=timeout,
+                                       cancel_event=cancel_event)
+
+        # download file from server
+        return self._download_export_file(url=self._export_file_url(result['fileId']), fileFormat=fileFormat,
+                                          on_progress=on_progress, chunk_size=chunk_size)
+
+    def _export_url(self):
+        return '{}/surveys/{}/export-responses/'.format(self.qualtrics.baseUrl, self.id)
+
+    def _export_file_url(self, fileId):
+        return self._export_url() + fileId + '/file'
+
+    def _start_export(self, fileFormat, **exportOptions):
+        res = self.qualtrics.transport.post_request(url=self._export_url(),
+                                                    payload=self._export_payload(fileFormat, **exportOptions))
+        if not res:
+            raise ExportFailed('export could not be started: {}'.format(res.text))
+        return res.json()['result']['progressId']
+
+    @staticmethod
+    def _export_payload(fileFormat,
+                        start_date=None,
+                        end_date=None,
+                        limit=None,
+                        use_labels=None,
+                        seen_unanswered_recode=None,
+                        multiselect_seen_unanswered_recode=None,
+                        include_display_order=None,
+                        format_decimal_as_comma=None,
+                        time_zone=None,
+                        newline_replacement=None,
+                        question_ids=None,
+                        embedded_data_ids=None,
+                        survey_metadata_ids=None,
+                        compress=None,
+                        allow_continuation=None,
+                        continuation_token=None):
         data = {'format': fileFormat}
         for var, varname in [
             [start_date, 'startDate'],
@@ -927,39 +2870,300 @@ class Survey:
             [question_ids, 'questionIds'],
             [embedded_data_ids, 'embeddedDataIds'],
             [survey_metadata_ids, 'surveyMetadataIds'],
-            [compress, 'compress']]:
+            [allow_continuation, 'allowContinuation'],
+            [continuation_token, 'continuationToken']]:
             if var:
                 data[varname] = var
+        if compress is not None:
+            data['compress'] = compress
+        return data
 
-        # export responses server-side
-        downloadBaseUrl = '{}/surveys/{}/export-responses/'.format(self.qualtrics.baseUrl, self.id)
-        res = post_request(url=downloadBaseUrl, payload=data)
-        progressId = res.json()['result']['progressId']
-        while downloadStatus not in ['complete', 'failed']:
-            checkStatusUrl = downloadBaseUrl + progressId
-            res = get_request(url=checkStatusUrl)
-            if verboseRequests:
-                downloadProgress = res.json()['result']['percentComplete']
-                logging.info("Download is {0:.2f}% complete".format(downloadProgress))
-            downloadStatus = res.json()['result']['status']
-        if downloadStatus == 'failed':
-            raise Exception('export failed')
-        fileId = res.json()['result']['fileId']
+    def _check_export(self, progressId):
+        """
+        Check on an export once
+        :param progressId: Export job to check
+        :return: export result (fileId, continuationToken, ...) if the export is complete, otherwise None
+        """
+        res = self.qualtrics.transport.get_request(url=self._export_url() + progressId, cache=False)
+        if not res:  # treat as transient, caller keeps polling
+            return None
+        result = res.json()['result']
+        if self.qualtrics.transport.verbose:
+            logging.info("Download is {0:.2f}% complete".format(result.get('percentComplete', 0)))
+        if result['status'] == 'complete':
+            return result
+        if result['status'] == 'failed':
+            raise ExportFailed('export failed', progressId=progressId)
+        return None
 
-        # download file from server
-        downloadFileUrl = downloadBaseUrl + fileId + '/file'
-        res = get_request(url=downloadFileUrl, stream=True)
-
-        # unzip file
-        zipfile.ZipFile(io.BytesIO(res.content)).extractall(self.responseFolder)
-        if verboseRequests:
-            logging.info("File downloaded and extracted")
-        self.responsesFile = "{}/{}.{}".format(self.responseFolder, self.name, fileFormat)
+    def _wait_for_export(self, progressId, poll_interval=0.5, max_poll_interval=10, timeout=None,
+                         cancel_event: threading.Event = None):
+        """
+        Poll an export with exponential backoff until Qualtrics has finished building the file
+        :param progressId: Export job to wait for
+        :param poll_interval: Seconds before the first check. Doubles (with jitter) after every check
+        :param max_poll_interval: Longest wait between checks
+        :param timeout: Give up after this many seconds. None waits forever
+        :param cancel_event: threading.Event that stops the wait when set
+        :return: export result (fileId, continuationToken, ...) of the finished export
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        for delay in _backoff_delays(initial=poll_interval, maximum=max_poll_interval, jitter=0.2):
+            if deadline is not None:
+                delay = min(delay, max(0.0, deadline - time.monotonic()))
+            if cancel_event:
+                if cancel_event.wait(delay):
+                    raise ExportCancelled('export cancelled', progressId=progressId)
+            else:
+                time.sleep(delay)
+            result = self._check_export(progressId=progressId)
+            if result:
+                return result
+            if deadline is not None and time.monotonic() >= deadline:
+                raise ExportTimeout('export not complete after {} seconds'.format(timeout), progressId=progressId)
+
+    def _download_export_file(self, url, fileFormat, on_progress=None, chunk_size=1024 * 1024):
+        # stream the export to a temporary file next to its destination, never holding the whole file in memory
+        os.makedirs(self.responseFolder, exist_ok=True)
+        res = self.qualtrics.transport.get_request(url=url, stream=True)
+        if not res:
+            raise Exception('export download failed: {}'.format(res.status_code))
+        totalBytes = int(res.headers['Content-Length']) if res.headers.get('Content-Length') else None
+        bytesReceived = 0
+        tmp = tempfile.NamedTemporaryFile(dir=self.responseFolder, suffix='.download', delete=False)
+        try:
+            with tmp, res:
+                for chunk in res.iter_content(chunk_size=chunk_size):
+                    tmp.write(chunk)
+                    bytesReceived += len(chunk)
+                    if on_progress:
+                        on_progress(bytesReceived, totalBytes)
+            responsesFile = self._extract_export_file(downloadedFile=tmp.name, fileFormat=fileFormat)
+        finally:
+            if os.path.exists(tmp.name):
+                os.remove(tmp.name)
+        if self.qualtrics.transport.verbose:
+            logging.info("File downloaded and extracted ({} bytes)".format(bytesReceived))
+        self.responsesFile = responsesFile
         return self.responsesFile
 
+    def _extract_export_file(self, downloadedFile, fileFormat):
+        responsesFile = "{}/{}.{}".format(self.responseFolder, self.name, fileFormat)
+        if not zipfile.is_zipfile(downloadedFile):  # compress=False exports arrive as the raw file
+            shutil.move(downloadedFile, responsesFile)
+        elif fileFormat in STREAMED_EXPORT_FORMATS:  # parsed straight out of the archive later on
+            responsesFile += '.zip'
+            shutil.move(downloadedFile, responsesFile)
+        else:
+            # unzip file
+            with zipfile.ZipFile(downloadedFile) as archive:
+                archive.extractall(self.responseFolder)
+        return responsesFile
+
+    def _responses_format(self, responsesFile: str = None):
+        responsesFile = responsesFile or self.responsesFile
+        if not responsesFile:
+            return None
+        name = responsesFile[:-len('.zip')] if responsesFile.endswith('.zip') else responsesFile
+        return name.rsplit('.', 1)[-1]
+
+    @contextlib.contextmanager
+    def _open_responses_file(self):
+        # text stream over the export, read directly from inside the ZIP when it was kept compressed
+        if zipfile.is_zipfile(self.responsesFile):
+            with zipfile.ZipFile(self.responsesFile) as archive:
+                with io.TextIOWrapper(archive.open(archive.namelist()[0]), encoding='utf-8-sig') as f:
+                    yield f
+        else:
+            with open(self.responsesFile, encoding='utf-8-sig') as f:
+                yield f
+
+    def iter_response_records(self):
+        """
+        Stream the downloaded JSON/NDJSON export one response at a time, without loading the file into memory.
+        Metadata fields are renamed to their CSV column names (i.e. recordedDate -> RecordedDate)
+        :return: generator of (values, labels) dict pairs
+        """
+        fileFormat = self._responses_format()
+        if fileFormat not in STREAMED_EXPORT_FORMATS:
+            raise Exception("responses were not exported as json/ndjson")
+        with self._open_responses_file() as f:
+            for record in _iter_json_records(f, fileFormat):
+                yield _json_response_values(record), record.get('labels', {})
+
+    def _rewrite_response_records(self, edit):
+        # stream the JSON/NDJSON export through edit(record), which returns the record to keep or None to drop it,
+        # into a new file that then replaces the export, zipped again if it was
+        fileFormat = self._responses_format()
+        temporary = self.responsesFile + '.tmp'
+        with contextlib.ExitStack() as stack:
+            f = stack.enter_context(self._open_responses_file())
+            if zipfile.is_zipfile(self.responsesFile):
+                with zipfile.ZipFile(self.responsesFile) as archive:
+                    member = archive.namelist()[0]
+                archive = stack.enter_context(zipfile.ZipFile(temporary, 'w', zipfile.ZIP_DEFLATED))
+                out = stack.enter_context(io.TextIOWrapper(archive.open(member, 'w'), encoding='utf-8'))
+            else:
+                out = stack.enter_context(open(temporary, 'w', encoding='utf-8'))
+            if fileFormat != 'ndjson':
+                out.write('{"responses": [')
+            first = True
+            for record in _iter_json_records(f, fileFormat):
+                record = edit(record)
+                if record is None:
+                    continue
+                if fileFormat == 'ndjson':
+                    out.write(json.dumps(record) + '\n')
+                else:
+                    out.write(('' if first else ', ') + json.dumps(record))
+                first = False
+            if fileFormat != 'ndjson':
+                out.write(']}')
+        os.replace(temporary, self.responsesFile)
+
+    def iter_response_batches(self, batchSize: int = 10000):
+        """
+        Stream the downloaded JSON/NDJSON export as DataFrames of at most batchSize responses, with native types
+        :return: generator of pandas DataFrames
+        """
+        def frame(records):
+            batchFrame = pd.DataFrame.from_records(records)
+            for column in ['StartDate', 'EndDate', 'RecordedDate']:
+                if column in batchFrame.columns:
+                    batchFrame[column] = pd.to_datetime(batchFrame[column], utc=True)
+            return batchFrame
+
+        batch = []
+        for values, labels in self.iter_response_records():
+            batch.append(values)
+            if len(batch) >= batchSize:
+                yield frame(batch)
+                batch = []
+        if batch:
+            yield frame(batch)
+
+    def _iter_export_chunks(self, chunksize, columns=None):
+        # (frame, typed) pairs straight from the up-to-date ResponseStore, or raw rows from the export file
+        responseStore = self.qualtrics.responseStore
+        if responseStore and os.path.exists(responseStore.path(self)) and responseStore.is_current(self):
+            if responseStore.fileFormat == 'parquet':
+                batches = pyarrow.parquet.ParquetFile(responseStore.path(self), memory_map=True).iter_batches(
+                    batch_size=chunksize, columns=columns)
+            else:
+                table = pyarrow.feather.read_table(responseStore.path(self), columns=columns, memory_map=True)
+                batches = table.to_batches(max_chunksize=chunksize)
+            for batch in batches:
+                yield batch.to_pandas(), True
+        elif self._responses_format() in STREAMED_EXPORT_FORMATS:
+            wanted = set(columns) if columns else None
+            batch = []
+            for values, labels in self.iter_response_records():
+                batch.append({k: v for k, v in values.items() if k in wanted} if wanted else values)
+                if len(batch) >= chunksize:
+                    yield pd.DataFrame.from_records(batch), False
+                    batch = []
+            if batch:
+                yield pd.DataFrame.from_records(batch), False
+        else:
+            # first two rows are just a repeat of column headers, skip them
+            with pd.read_csv(self.responsesFile, skiprows=[1, 2], dtype=str, keep_default_na=False,
+                             usecols=(lambda column: column in columns) if columns else None,
+                             chunksize=chunksize) as reader:
+                for chunk in reader:
+                    yield chunk, False
+
+    def iter_response_chunks(self, chunksize: int = 100000, columns: list = None, filter: Filter = None):
+        """
+        Stream the downloaded responses as typed DataFrames of at most chunksize rows, never holding them all in
+        memory. Reads row batches from the ResponseStore when it is up to date, otherwise from the export file
+        :param chunksize: Rows per DataFrame
+        :param columns: Only return these columns. Optional
+        :param filter: Only return responses matching this Filter. Optional
+        :return: generator of pandas DataFrames
+        """
+        if not self.responsesFile:
+            raise Exception('No responses downloaded')
+        wanted = None
+        if columns:
+            wanted = list(dict.fromkeys(list(columns) + (filter.columns() if filter else [])))
+        settled = None
+        for chunk, typed in self._iter_export_chunks(chunksize, columns=wanted):
+            if filter is not None:  # masks compare typed store chunks by value, so they match the raw export rows
+                chunk = chunk[filter.mask(ResponseList(self, chunk)).to_numpy()]
+            if not typed:
+                if settled is None:
+                    settled = self._settle_chunk_types(chunksize, wanted)
+                schema, dtypes = settled
+                chunk = _typed_responses_frame(chunk.reindex(columns=list(schema)), schema).astype(dtypes)
+            yield chunk[list(columns)] if columns else chunk
+
+    def _settle_chunk_types(self, chunksize, columns=None):
+        # a raw chunk alone can't tell a number column from a text one whose first text answer comes later, so
+        # read the export once up front and give every chunk the types the whole file gets in one DataFrame
+        schema, dtypes, seen, chunks = {}, {}, {}, 0
+        ranks = ['int64', 'float64', 'string', 'object']
+        for chunk, _ in self._iter_export_chunks(chunksize, columns=columns):
+            chunks += 1
+            for column, columnType in _response_schema(self, chunk.columns).items():
+                schema.setdefault(column, columnType)
+            for column, values in _typed_responses_frame(chunk, schema).items():
+                seen[column] = seen.get(column, 0) + 1
+                if pd.api.types.is_bool_dtype(values) or pd.api.types.is_datetime64_any_dtype(values):
+                    continue  # the schema already fixes these
+                if pd.api.types.is_integer_dtype(values):
+                    dtype = 'int64'
+                elif pd.api.types.is_float_dtype(values):
+                    dtype = 'float64'
+                else:
+                    dtype = 'string' if isinstance(values.dtype, pd.StringDtype) else 'object'
+                if ranks.index(dtype) > ranks.index(dtypes.get(column, 'int64')):
+                    dtypes[column] = dtype
+                else:
+                    dtypes.setdefault(column, dtype)
+        for column, dtype in dtypes.items():
+            if dtype == 'int64' and seen[column] < chunks:  # missing from some JSON records
+                dtypes[column] = 'float64'
+            elif dtype == 'string':
+                schema[column] = 'string'  # raw values, so '1' in a text column never turns into '1.0'
+        return schema, {column: dtype for column, dtype in dtypes.items() if dtype != 'string'}
+
+    def count_answers(self, question_or_choice_id: str, filter: Filter = None, chunksize: int = 100000,
+                      dropna: bool = True):
+        """
+        Count the responses per answer to a question, streaming through the responses chunk by chunk
+        :param question_or_choice_id: Export column of the question, i.e. 'Q1' or 'QID1'
+        :param filter: Only count responses matching this Filter. Optional
+        :param chunksize: Rows read at a time
+        :param dropna: Leave out unanswered
+        :return: pandas Series {answer: count}, most frequent first
+        """
+        counts = pd.Series(dtype='int64')
+        for chunk in self.iter_response_chunks(chunksize=chunksize, columns=[question_or_choice_id], filter=filter):
+            values = chunk[question_or_choice_id]
+            if values.map(lambda value: isinstance(value, list)).any():  # multi-select answers in JSON exports
+                values = values.explode()
+            counts = counts.add(values.value_counts(dropna=dropna), fill_value=0)
+        return counts.astype('int64').sort_values(ascending=False)
+
+    def count_responses_per_day(self, dateField: str = 'RecordedDate', filter: Filter = None,
+                                chunksize: int = 100000):
+        """
+        Count the responses per calendar day, streaming through the responses chunk by chunk
+        :param dateField: Date column to group by
+        :param filter: Only count responses matching this Filter. Optional
+        :param chunksize: Rows read at a time
+        :return: pandas Series {day: count}, in date order
+        """
+        counts = pd.Series(dtype='int64')
+        for chunk in self.iter_response_chunks(chunksize=chunksize, columns=[dateField], filter=filter):
+            days = _parse_dates(chunk[dateField]).dt.normalize()
+            counts = counts.add(days.value_counts(), fill_value=0)
+        return counts.astype('int64').sort_index()
+
     def get_responses(self,
                       folderName=None,
                       re_download=False,
+                      fileFormat='csv',
                       start_date=None,
                       end_date=None,
                       limit=None,
@@ -974,11 +3178,27 @@ class Survey:
                       embedded_data_ids=None,
                       survey_metadata_ids=None,
                       compress=None,
+                      on_progress=None,
+                      timeout=None,
+                      cancel_event: threading.Event = None,
+                      columns: list = None,
+                      export_columns: bool = False,
                       skipAPICalls: bool = False):
+        """
+        Export the survey's responses if needed, then parse them
+        :param columns: Only parse these export columns (ResponseId is always kept). Optional
+        :param export_columns: Also limit a new export to columns, through questionIds/embeddedDataIds/surveyMetadataIds
+        :return: [Response, Response, Response, ...]
+        """
         try:
-            if re_download or (folderName and folderName != self.responseFolder) or not self.responsesFile:
-                time.sleep(1)  # have to wait for API server to catch up
-                self._export_survey(fileFormat='csv',
+            if columns and export_columns:
+                exportColumns = self._export_column_options(columns)
+                question_ids = question_ids or exportColumns['question_ids']
+                embedded_data_ids = embedded_data_ids or exportColumns['embedded_data_ids']
+                survey_metadata_ids = survey_metadata_ids or exportColumns['survey_metadata_ids']
+            if re_download or (folderName and folderName != self.responseFolder) or not self.responsesFile \
+                    or self._responses_format() != fileFormat:
+                self._export_survey(fileFormat=fileFormat,
                                     folderName=folderName,
                                     start_date=start_date,
                                     end_date=end_date,
@@ -993,44 +3213,380 @@ class Survey:
                                     question_ids=question_ids,
                                     embedded_data_ids=embedded_data_ids,
                                     survey_metadata_ids=survey_metadata_ids,
-                                    compress=compress)
+                                    compress=compress,
+                                    on_progress=on_progress,
+                                    timeout=timeout,
+                                    cancel_event=cancel_event)
                 self.responses = None
-            if not self.responses:
-                self.responses = []
-                with open(self.responsesFile) as f:
-                    csvReader = csv.DictReader(f)
-                    rows = list(csvReader)
-                    for row in rows:
-                        self.responses.append(
-                            Response(data=row, survey=self, qualtrics=self.qualtrics, skipAPICalls=skipAPICalls))
-                self.responses.pop(0)  # first two rows are just a repeat of column headers, delete them
-                self.responses.pop(0)
-                # for response in self.responses:
-                #    self._get_questions_for_response(response)
+            if not self.responses or not self.responses.covers(columns):
+                self._load_responses(skipAPICalls=skipAPICalls, columns=columns)
             return self.responses
+        except ExportError:
+            raise
         except Exception as e:
             logging.error(e)
             return None
 
+    def _read_response_rows(self, columns: list = None):
+        # parse the export into one DataFrame of rows (and per-row labels for JSON), keeping only columns if given
+        wanted = None
+        if columns:
+            wanted = set(columns) | {'ResponseId'}
+        labels = None
+        if self._responses_format() in STREAMED_EXPORT_FORMATS:
+            labels, frames, batch = [], [], []
+            for values, recordLabels in self.iter_response_records():
+                if wanted:
+                    values = {k: v for k, v in values.items() if k in wanted}
+                    recordLabels = {k: v for k, v in recordLabels.items() if k in wanted}
+                batch.append(values)
+                labels.append(recordLabels)
+                if len(batch) >= 10000:
+                    frames.append(pd.DataFrame.from_records(batch))
+                    batch = []
+            if batch:
+                frames.append(pd.DataFrame.from_records(batch))
+            rows = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        else:
+            # first two rows are just a repeat of column headers, skip them
+            rows = pd.read_csv(self.responsesFile, skiprows=[1, 2], dtype=str, keep_default_na=False,
+                               usecols=(lambda column: column in wanted) if wanted else None)
+        return rows, labels
+
+    def _load_responses(self, skipAPICalls: bool = False, columns: list = None):
+        # the file is parsed once; Response objects and the typed DataFrame are both built from these rows
+        rows, labels = self._read_response_rows(columns=columns)
+        projection = sorted(set(columns) | {'ResponseId'}) if columns else None
+        self.responses = ResponseList(self, rows, labels=labels, skipAPICalls=skipAPICalls, projection=projection)
+        self.responseDataframe = None
+        return self.responses
+
+    def _response_rows(self, columns: list = None):
+        if not isinstance(self.responses, ResponseList) or not self.responses.covers(columns):
+            self._load_responses(columns=columns)
+        return self.responses.rows
+
     def get_response(self, response_id, re_download=False, skipAPICalls: bool = False):
         if re_download or not self.responses:
             self.get_responses(re_download=re_download, folderName=self.responseFolder, skipAPICalls=skipAPICalls)
-        for response in self.responses:
-            if response_id == response.id:
-                return response
+        if self.responses:
+            return self.responses.find('id', response_id)
         return None
 
+    def _sync_state_file(self):
+        return "{}/{}.sync.json".format(self.responseFolder, self.name)
+
+    def _load_sync_state(self):
+        try:
+            with open(self._sync_state_file()) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_sync_state(self, state: dict):
+        with open(self._sync_state_file(), 'w') as f:
+            json.dump(state, f)
+
+    def sync_responses(self, folderName=None, timeout=None, cancel_event: threading.Event = None,
+                       skipAPICalls: bool = False, **exportOptions):
+        """
+        Bring the downloaded responses up to date by exporting only what is new since the last sync.
+        Uses Qualtrics continuation tokens, falling back to the last RecordedDate as startDate.
+        New and changed responses are merged into the responses file by ResponseId
+        :param folderName: specify location of results. Optional
+        :param timeout: Raise ExportTimeout if an export isn't ready after this many seconds. Optional
+        :param cancel_event: threading.Event that cancels the export when set. Optional
+        :param exportOptions: Passed to the export request, i.e. use_labels, question_ids
+        :return: number of new or changed responses
+        """
+        if folderName:
+            self.responseFolder = folderName
+        if not self.responseFolder:
+            raise Exception('No response folder assigned')
+        if not self.responsesFile:
+            candidate = "{}/{}.csv".format(self.responseFolder, self.name)
+            if os.path.exists(candidate):
+                self.responsesFile = candidate
+        state = self._load_sync_state() if self.responsesFile else {}
+        if state.get('continuationToken'):
+            exportOptions['continuation_token'] = state['continuationToken']
+        else:
+            exportOptions['allow_continuation'] = True
+            if state.get('lastRecordedDate') and not exportOptions.get('start_date'):
+                # RecordedDate is in the export's time zone but startDate is UTC; go back by the largest UTC
+                # offset so nothing recorded in between is skipped. The merge drops the repeats by ResponseId
+                start = pd.Timestamp(state['lastRecordedDate']) - pd.Timedelta(hours=14)
+                exportOptions['start_date'] = start.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+        progressId = self._start_export(fileFormat='csv', **exportOptions)
+        result = self._wait_for_export(progressId=progressId, timeout=timeout, cancel_event=cancel_event)
+        mainFile = self.responsesFile if self._responses_format() == 'csv' else None
+        deltaFolder = tempfile.mkdtemp(dir=self.responseFolder, prefix='.sync')
+        try:
+            self.responseFolder = deltaFolder
+            deltaFile = self._download_export_file(url=self._export_file_url(result['fileId']), fileFormat='csv')
+        finally:
+            self.responseFolder = os.path.dirname(deltaFolder)
+        try:
+            merged, changed = self._merge_responses_file(mainFile=mainFile, deltaFile=deltaFile)
+        finally:
+            shutil.rmtree(deltaFolder, ignore_errors=True)
+        self.responsesFile = merged
+
+        if 'RecordedDate' in changed.columns and len(changed):
+            lastRecordedDate = str(pd.to_datetime(changed['RecordedDate']).max())
+            if state.get('lastRecordedDate'):
+                lastRecordedDate = max(lastRecordedDate, state['lastRecordedDate'])
+            state['lastRecordedDate'] = lastRecordedDate
+        state['continuationToken'] = result.get('continuationToken')
+        self._save_sync_state(state)
+
+        self.responses = IndexedList(id='id')
+        self._load_responses(skipAPICalls=skipAPICalls)
+        self._create_responses_dataframe()
+        return len(changed)
+
+    def _merge_responses_file(self, mainFile, deltaFile):
+        # keep the two repeated header rows Qualtrics puts under the column names, newest copy of each response wins
+        responsesFile = "{}/{}.csv".format(self.responseFolder, self.name)
+        delta = pd.read_csv(deltaFile, dtype=str, keep_default_na=False)
+        changed = delta.iloc[2:]
+        if not mainFile or not os.path.exists(mainFile):
+            if os.path.abspath(deltaFile) != os.path.abspath(responsesFile):
+                shutil.move(deltaFile, responsesFile)
+            return responsesFile, changed
+        main = pd.read_csv(mainFile, dtype=str, keep_default_na=False)
+        headerRows = main.iloc[:2].combine_first(delta.iloc[:2])
+        rows = pd.concat([main.iloc[2:], changed], ignore_index=True)
+        if 'ResponseId' in rows.columns:
+            rows = rows.drop_duplicates(subset='ResponseId', keep='last')
+        columns = list(main.columns) + [column for column in delta.columns if column not in main.columns]
+        merged = pd.concat([headerRows, rows], ignore_index=True)[columns].fillna('')
+        merged.to_csv(responsesFile, index=False)
+        return responsesFile, changed
+
+    def _drop_responses(self, response_ids):
+        # remove responses from the local store without downloading anything
+        response_ids = set(response_ids)
+        fileFormat = self._responses_format()
+        if fileFormat == 'csv' and os.path.exists(self.responsesFile):
+            stored = pd.read_csv(self.responsesFile, dtype=str, keep_default_na=False)
+            keep = stored.index < 2
+            if 'ResponseId' in stored.columns:
+                keep = keep | ~stored['ResponseId'].isin(response_ids)
+            stored[keep].to_csv(self.responsesFile, index=False)
+        elif fileFormat in STREAMED_EXPORT_FORMATS and os.path.exists(self.responsesFile):
+            self._rewrite_response_records(
+                lambda record: None if _json_response_values(record).get('ResponseId') in response_ids else record)
+        if isinstance(self.responses, ResponseList) and 'ResponseId' in self.responses.rows.columns:
+            self.responses = self.responses.without(response_ids)
+        elif self.responses:
+            self.responses = IndexedList([response for response in self.responses if response.id not in response_ids],
+                                         id='id')
+        frame = self._responseDataframe
+        if frame is not None and 'ResponseId' in frame.columns:
+            self.responseDataframe = frame[~frame['ResponseId'].isin(response_ids)]
+
+    def _patch_responses(self, updates: dict):
+        # apply field changes to the responses file, the parsed responses and the DataFrame, without exporting
+        fileFormat = self._responses_format()
+        if fileFormat in STREAMED_EXPORT_FORMATS and os.path.exists(self.responsesFile):
+            def patch(record):
+                fields = updates.get(_json_response_values(record).get('ResponseId'))
+                if fields:
+                    record.setdefault('values', {}).update(fields)
+                return record
+
+            self._rewrite_response_records(patch)
+        elif fileFormat == 'csv' and os.path.exists(self.responsesFile):
+            stored = pd.read_csv(self.responsesFile, dtype=str, keep_default_na=False)
+            # first two rows are just a repeat of column headers
+            positions = {responseId: position for position, responseId in enumerate(stored['ResponseId'])
+                         if position >= 2}
+            byField = collections.defaultdict(dict)
+            for responseId, fields in updates.items():
+                if responseId in positions:
+                    for field, value in fields.items():
+                        byField[field][positions[responseId]] = '' if value is None else str(value)
+            for field, values in byField.items():
+                if field not in stored.columns:  # new embedded data field, with its two header rows
+                    stored[field] = ''
+                    stored.loc[0, field] = field
+                    stored.loc[1, field] = json.dumps({'ImportId': field})
+                stored.iloc[list(values), stored.columns.get_loc(field)] = list(values.values())
+            stored.to_csv(self.responsesFile, index=False)
+        if isinstance(self.responses, ResponseList):
+            self.responses.patch(updates)
+        frame = self._responseDataframe
+        if frame is not None and 'ResponseId' in frame.columns:
+            try:
+                positions = {responseId: position for position, responseId in enumerate(frame['ResponseId'])}
+                byField = collections.defaultdict(dict)
+                for responseId, fields in updates.items():
+                    if responseId in positions:
+                        for field, value in fields.items():
+                            byField[field][positions[responseId]] = value
+                for field, values in byField.items():
+                    frame.iloc[list(values), frame.columns.get_loc(field)] = list(values.values())
+            except (KeyError, TypeError, ValueError):  # new column or a value its dtype can't hold, retype instead
+                self.responseDataframe = None
+
+    def update_responses(self, updates: dict, resetRecordedDate: bool = True, max_concurrency: int = 8,
+                         bulk: bool = False, batchSize: int = 1000, pollInterval: float = 0.5,
+                         maxPollInterval: float = 10, timeout: float = 600):
+        """
+        Set embedded data on many responses, then patch the downloaded responses instead of exporting them again.
+        RecordedDate is not patched locally; sync_responses() picks up what the API changed besides the fields
+        :param updates: {ResponseId: {'field': value}}
+        :param resetRecordedDate: Have Qualtrics set the responses' RecordedDate to now
+        :param max_concurrency: Update requests in flight at once
+        :param bulk: Send the updates through Qualtrics' bulk update-responses jobs instead of one PUT per response
+        :param batchSize: With bulk, responses per job
+        :param pollInterval: With bulk, seconds to wait before first checking on a job. Doubles on every check
+        :param maxPollInterval: With bulk, longest wait between job checks
+        :param timeout: With bulk, stop waiting on a job after this many seconds; its responses then get an
+        ExportTimeout. None waits forever
+        :return: {ResponseId: True or the Exception that made its update fail}
+        """
+        if bulk:
+            results = {}
+            items = list(updates.items())
+            for start in range(0, len(items), batchSize):
+                results.update(self._run_response_update_job(dict(items[start:start + batchSize]), resetRecordedDate,
+                                                             pollInterval, maxPollInterval, timeout))
+        else:
+            def update(responseId, fields):
+                res = self.qualtrics.transport.put_request(
+                    '{baseUrl}/responses/{r_id}'.format(baseUrl=self.qualtrics.baseUrl, r_id=responseId),
+                    payload={'surveyId': self.id, 'embeddedData': fields, 'resetRecordedDate': resetRecordedDate})
+                if not res:
+                    raise Exception('response update failed: {}'.format(res.text))
+                return True
+
+            results = self._run_concurrently(update, updates.items(), max_concurrency)
+        self._patch_responses({responseId: updates[responseId] for responseId, result in results.items()
+                               if result is True})
+        return results
+
+    def _run_response_update_job(self, updates, resetRecordedDate, pollInterval, maxPollInterval, timeout):
+        jobsUrl = '{baseUrl}/surveys/{s_id}/update-responses'.format(baseUrl=self.qualtrics.baseUrl, s_id=self.id)
+        payload = {'updates': [{'responseId': responseId, 'embeddedData': fields,
+                                'resetRecordedDate': resetRecordedDate} for responseId, fields in updates.items()],
+                   'ignoreMissingResponses': True}
+        res = self.qualtrics.transport.post_request(url=jobsUrl, payload=payload)
+        if not res:
+            error = Exception('response update job failed to start: {}'.format(res.text))
+            return {responseId: error for responseId in updates}
+        result = res.json()['result']
+        progressId = result.get('progressId') or result.get('id')
+        status, _ = _poll_job(self.qualtrics.transport, url='{}/{}'.format(jobsUrl, progressId),
+                              description='Response update job {}'.format(progressId),
+                              pollInterval=pollInterval, maxPollInterval=maxPollInterval, timeout=timeout)
+        if status == 'timedOut':
+            error = ExportTimeout('response update job not complete after {} seconds'.format(timeout),
+                                  progressId=progressId)
+            return {responseId: error for responseId in updates}
+        if status != 'complete':
+            error = Exception('response update job {} {}'.format(progressId, status))
+            return {responseId: error for responseId in updates}
+        return {responseId: True for responseId in updates}
+
+    def delete_responses(self, response_ids, decrementQuotas: bool = True, max_concurrency: int = 8):
+        """
+        Delete many responses concurrently, then drop them from the downloaded responses once
+        :param response_ids: ResponseIds to delete
+        :param decrementQuotas: Give the responses' quota counts back
+        :param max_concurrency: Delete requests in flight at once
+        :return: {ResponseId: True or the Exception that made its deletion fail}
+        """
+        def delete(responseId, _):
+            res = self.qualtrics.transport.delete_request(
+                url='{baseUrl}/surveys/{s_id}/responses/{r_id}?decrementQuotas={quota}'.format(
+                    baseUrl=self.qualtrics.baseUrl, s_id=self.id, r_id=responseId,
+                    quota=str(decrementQuotas).lower()))
+            if not res:
+                raise Exception('response deletion failed: {}'.format(res.text))
+            return True
+
+        results = self._run_concurrently(delete, [(responseId, None) for responseId in response_ids],
+                                         max_concurrency)
+        deleted = [responseId for responseId, result in results.items() if result is True]
+        if deleted:
+            self._drop_responses(deleted)
+        return results
+
+    @staticmethod
+    def _run_concurrently(call, items, max_concurrency):
+        # {key: call(key, value) or the exception it raised}, at most max_concurrency at a time
+        results = {}
+        with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+            futures = {pool.submit(call, key, value): key for key, value in items}
+            for future, key in futures.items():
+                try:
+                    results[key] = future.result()
+                except Exception as e:
+                    results[key] = e
+        return results
+
     def _create_responses_dataframe(self):
+        # typed frame over the same rows and columns as self.responses
         if self.responsesFile:
             try:
-                self.responseDataframe = pd.read_csv(self.responsesFile, skiprows=[1, 2])
-                return self.responseDataframe
+                responseStore = self.qualtrics.responseStore
+                if responseStore:
+                    projection = self.responses.projection if isinstance(self.responses, ResponseList) else None
+                    self.responseDataframe = self._read_response_store(columns=projection)
+                else:  # typed from the rows the responses were parsed into, the file isn't read again
+                    rows = self.responses.rows if isinstance(self.responses, ResponseList) else self._response_rows()
+                    self.responseDataframe = _typed_responses_frame(rows, _response_schema(self, rows.columns))
+                return self._responseDataframe
             except Exception as e:
                 logging.error(e)
         return None
 
+    def get_responses_dataframe(self, columns: list = None, folderName=None, re_download=False, **exportOptions):
+        """
+        Responses as a typed pandas DataFrame
+        :param columns: Only load these export columns. Read straight from the columnar ResponseStore if there is
+        one, otherwise only these columns are parsed from the export. Optional
+        :param folderName: specify location of results. Optional
+        :param re_download: Force re-download of survey results. Optional
+        :param exportOptions: Passed to get_responses, i.e. export_columns=True
+        :return: pandas DataFrame
+        """
+        if re_download or folderName or not self.responsesFile:
+            self.get_responses(folderName=folderName, re_download=re_download, columns=columns, **exportOptions)
+        covered = isinstance(self.responses, ResponseList) and self.responses.covers(columns)
+        frame = self._responseDataframe if covered else None
+        if frame is None:
+            if columns and self.qualtrics.responseStore:  # no need to parse the export at all
+                return self._read_response_store(columns=list(columns))
+            self._response_rows(columns=columns)
+            frame = self.responseDataframe
+        return frame[list(columns)] if columns else frame
+
+    def _read_response_store(self, columns: list = None):
+        responseStore = self.qualtrics.responseStore
+        if not responseStore.is_current(self):
+            responseStore.write(self)
+        return responseStore.read(self, columns=columns)
+
+    def _ensure_columns(self, columns, folderName=None, re_download=False):
+        # make sure the parsed responses hold columns (all of them when columns is None)
+        if re_download or folderName or not isinstance(self.responses, ResponseList) \
+                or not self.responses.covers(columns):
+            self.get_responses(folderName=folderName, re_download=re_download, columns=columns)
+
+    def _select_responses(self, mask, dataFrame=False, columns: list = None):
+        if dataFrame:
+            frame = self.responseDataframe
+            if columns:
+                frame = frame[[column for column in columns if column in frame.columns]]
+            return frame.iloc[pd.Series(mask).to_numpy()]
+        return self.responses.select(mask)
+
     def filter_responses_by_text(self, filters={}, existingFilter=None, saveFilter=False, folderName=None,
-                                 re_download=False, dataFrame=False):
+                                 re_download=False, dataFrame=False, columns: list = None):
         """
         Apply multiple text filters to downloaded responses
         :param filters: a dictionary of {'FieldName1': ['Value1', 'Value2'], 'FieldName2': ['Value1']}
@@ -1039,47 +3595,36 @@ class Survey:
         :param folderName: specify location of results. Results will be re-downloaded regardless. Optional
         :param re_download: Delete self.responses and force re-download of survey results. Optional
         :param dataFrame: Optionally return a pandas dataframe rather than list of Response objects
+        :param columns: Only load (and return, with dataFrame) these columns besides the filtered ones. Optional
         :return: [Response, Response, Response, ...](, Filter (Optional))
         """
+        if existingFilter is not None and type(existingFilter) is not Filter:  # composed filter
+            filtered_responses = self.filter_responses(existingFilter, folderName=folderName,
+                                                       re_download=re_download, dataFrame=dataFrame, columns=columns)
+            if saveFilter:
+                return filtered_responses, existingFilter
+            return filtered_responses
         if existingFilter:
             filters = existingFilter.filter
-        if re_download or folderName or (self.responseDataframe is None):
-            self.get_responses(folderName=folderName, re_download=re_download)
-            self._create_responses_dataframe()
+        self._ensure_columns(list(columns) + list(filters or {}) if columns else None, folderName=folderName,
+                             re_download=re_download)
         # check for exceptions
         if not filters:
             raise Exception("filters dictionary cannot be empty")
-        for field in filters.keys():
-            if not self.responses[0].data.get(field):
-                raise Exception("'{}' is not a valid response field".format(field))
         for field, values in filters.items():
+            self.responses.column(field)
             if not values:
                 raise Exception("'{}' values cannot be empty".format(field))
-        if dataFrame:
-            responses_dataframe = self.responseDataframe
-            masks = []
-            for field, values in filters.items():
-                masks.append(responses_dataframe[field].isin(values))
-            for mask in masks:
-                responses_dataframe = responses_dataframe.loc[mask]
-            if saveFilter:
-                saved_filter = Filter(filters)
-                return responses_dataframe, saved_filter
-            return responses_dataframe
-        else:
-            filtered_responses = []
-            for response in self.responses:
-                passes = True
-                for column, values in filters.items():
-                    if response.data[column] not in values:
-                        passes = False
-                        break
-                if passes:
-                    filtered_responses.append(response)
-            return filtered_responses
+        mask = pd.Series(True, index=self.responses.rows.index)
+        for field, values in filters.items():
+            mask &= _text_mask(self.responses.column(field), values)
+        filtered_responses = self._select_responses(mask, dataFrame=dataFrame, columns=columns)
+        if saveFilter:
+            return filtered_responses, Filter(filters)
+        return filtered_responses
 
     def filter_responses_by_date(self, filters: dict = None, existingFilter=None, saveFilter=False, folderName=None,
-                                 re_download=False, dataFrame=False):
+                                 re_download=False, dataFrame=False, columns: list = None):
         """
         Apply multiple date filters to downloaded responses
         :param filters: a dictionary of {'FieldName1': ['Date1', 'before'], 'FieldName2': ['Date2', 'after']}.
@@ -1089,49 +3634,83 @@ class Survey:
         :param folderName: specify location of results. Results will be re-downloaded regardless. Optional
         :param re_download: Delete self.responses and force re-download of survey results. Optional
         :param dataFrame: Optionally return a pandas dataframe rather than list of Response objects
+        :param columns: Only load (and return, with dataFrame) these columns besides the filtered ones. Optional
         :return: [Response, Response, Response, ...](, Filter (Optional))
         """
+        if existingFilter is not None and type(existingFilter) is not Filter:  # composed filter
+            filtered_responses = self.filter_responses(existingFilter, folderName=folderName,
+                                                       re_download=re_download, dataFrame=dataFrame, columns=columns)
+            if saveFilter:
+                return filtered_responses, existingFilter
+            return filtered_responses
         if existingFilter:
             filters = existingFilter.filter
-        if re_download or folderName or (self.responseDataframe is None):
-            self.get_responses(folderName=folderName, re_download=re_download)
-            self._create_responses_dataframe()
+        self._ensure_columns(list(columns) + list(filters or {}) if columns else None, folderName=folderName,
+                             re_download=re_download)
         # check for exceptions
         if not filters:
             raise Exception("filters dictionary cannot be empty")
-        for field in filters.keys():
-            if not self.responses[0].data.get(field):
-                raise Exception("'{}' is not a valid response field".format(field))
         for field, values in filters.items():
+            self.responses.column(field)
             if not values or len(values) != 2:
                 raise Exception("'{}' value must be ['date', 'before/after']".format(field))
-        if dataFrame:
-            responses_dataframe = self.responseDataframe
-            masks = []
-            for field, values in filters.items():
-                if not str(values[1]).startswith('be') and not str(values[1]).startswith('a'):
-                    raise Exception("'{}' value must be ['date', 'before/after']".format(field))
-                if str(values[1]).startswith('b'):  # before
-                    masks.append(responses_dataframe[field] < values[0])
-                if str(values[1]).startswith('a'):  # after
-                    masks.append(responses_dataframe[field] > values[0])
-            for mask in masks:
-                responses_dataframe = responses_dataframe.loc[mask]
-            if saveFilter:
-                saved_filter = Filter(filters)
-                return responses_dataframe, saved_filter
-            return responses_dataframe
+            if not str(values[1]).startswith('b') and not str(values[1]).startswith('a'):
+                raise Exception("'{}' value must be ['date', 'before/after']".format(field))
+        mask = pd.Series(True, index=self.responses.rows.index)
+        for field, values in filters.items():
+            mask &= _date_mask(self.responses.dates(field), stamp=values[0], beforeAfter=values[1])
+        filtered_responses = self._select_responses(mask, dataFrame=dataFrame, columns=columns)
+        if saveFilter:
+            return filtered_responses, Filter(filters)
+        return filtered_responses
+
+    def filter_responses(self, filter: Filter, pushdown: bool = False, columns: list = None, folderName=None,
+                         re_download=False, dataFrame=False, **exportOptions):
+        """
+        Apply a (composed) Filter to the responses
+        :param filter: Filter, i.e. InFilter('Q1', ['1', '2']) & ~EqualsFilter('Finished', '0')
+        :param pushdown: Export again, restricted by the filter's date bounds (and columns, if given), so only the
+        data needed is downloaded. The downloaded responses file then only holds that subset
+        :param columns: Only load (and return, with dataFrame) these columns besides the ones the filter reads.
+        With pushdown, the export itself is limited to them too. Optional
+        :param folderName: specify location of results. Optional
+        :param re_download: Delete self.responses and force re-download of survey results. Optional
+        :param dataFrame: Optionally return a pandas dataframe rather than list of Response objects
+        :param exportOptions: Passed to get_responses when exporting
+        :return: [Response, Response, Response, ...]
+        """
+        needed = list(columns) + filter.columns() if columns else None
+        if pushdown:
+            exportOptions.update(filter.export_options())
+            if needed:
+                exportOptions.update(self._export_column_options(needed))
+            self.get_responses(folderName=folderName, re_download=True, columns=needed, **exportOptions)
         else:
-            filtered_responses = []
-            for response in self.responses:
-                passes = True
-                for column, values in filters.items():
-                    if not _compare_timestamps(stamp1=response.data[column], stamp2=values[0], beforeAfter=values[1]):
-                        passes = False
-                        break
-                if passes:
-                    filtered_responses.append(response)
-            return filtered_responses
+            self._ensure_columns(needed, folderName=folderName, re_download=re_download)
+        return self._select_responses(filter.mask(self.responses), dataFrame=dataFrame, columns=columns)
+
+    def _export_column_options(self, columns):
+        # export column names -> questionIds / embeddedDataIds / surveyMetadataIds
+        metadataIds = {column: field for field, column in JSON_RESPONSE_FIELDS.items()}
+        exportTags = {}
+        for question in self.questions or self.get_questions() or []:
+            exportTags[question.data.get('DataExportTag') or question.id] = question.id
+        questionIds, embeddedDataIds, surveyMetadataIds = [], [], ['_recordId']
+        for column in dict.fromkeys(columns):
+            if column in metadataIds:
+                surveyMetadataIds.append(metadataIds[column])
+                continue
+            tag = max((tag for tag in exportTags if column == tag or column.startswith(tag + '_')), key=len,
+                      default=None)
+            if tag:
+                questionIds.append(exportTags[tag])
+            elif re.match(r'^QID\d+', column):
+                questionIds.append(column.split('_')[0])
+            else:
+                embeddedDataIds.append(column)
+        return {'question_ids': list(dict.fromkeys(questionIds)),
+                'embedded_data_ids': embeddedDataIds,
+                'survey_metadata_ids': list(dict.fromkeys(surveyMetadataIds))}
 
     def filter_responses_by_answer_to_question(self, question_or_choice_id: str, answer_ids: list = []):
         """
@@ -1146,16 +3725,26 @@ class Survey:
         return self.filter_responses_by_text(filters=filters)
 
     def get_questions(self, forceUpdate: bool = False):
-        if forceUpdate or not self.questions:
-            time.sleep(1)  # have to wait for API server to catch up
-            questions = []
-            res = get_request(
-                url='{baseUrl}/survey-definitions/{id}/questions'.format(baseUrl=self.qualtrics.baseUrl, id=self.id))
-            if res:
-                for question in res.json()['result']['elements']:
-                    questions.append(Question(data=question, qualtrics=self.qualtrics))
+        if forceUpdate or not self._questions:
+            metadataCache = self.qualtrics.metadataCache
+            elements = None
+            if metadataCache and not forceUpdate:
+                elements = metadataCache.load_item(self.qualtrics._metadataNamespace, 'survey_questions', self.id)
+            if elements is None:
+                res = self.qualtrics.transport.get_request(
+                    url='{baseUrl}/survey-definitions/{id}/questions'.format(baseUrl=self.qualtrics.baseUrl,
+                                                                            id=self.id))
+                if res:
+                    elements = res.json()['result']['elements']
+                    if metadataCache:
+                        metadataCache.save_item(self.qualtrics._metadataNamespace, 'survey_questions', self.id,
+                                                elements)
+            if elements is not None:
+                questions = IndexedList(id='id', text='text')
+                for question in elements:
+                    questions.append(Question(data=question, survey=self, qualtrics=self.qualtrics))
                 self.questions = questions
-        return self.questions
+        return self._questions
 
     def get_question(self, question_id: str = None, question_text: str = None, forceUpdate: bool = False,
                      skipAPICalls: bool = False):
@@ -1163,11 +3752,7 @@ class Survey:
             return None
         questions = self.get_questions(forceUpdate=forceUpdate)
         if questions:
-            for question in questions:
-                if question_id and question_id == question.id:
-                    return question
-                if question_text and question_text == question.text:
-                    return question
+            return questions.find('id', question_id) or questions.find('text', question_text)
         return None
 
     """
@@ -1206,7 +3791,7 @@ class Survey:
             pass
         else:  # just copy survey under same user
             if not self.owner or not isinstance(self.owner, User):  # self.owner = None or id rather than User object
-                new_self_owner = self.qualtrics.get_user(user_id=self.owner)  # try to get User and store as self.owner
+                new_self_owner = self._find_user(self.owner)  # try to get User and store as self.owner
                 if new_self_owner:
                     self.owner = new_self_owner
                     new_owner_id = self.owner.id
@@ -1222,20 +3807,21 @@ class Survey:
         data = {}
         if new_name:
             data = {"projectName": new_name}
-        res = post_request(url='{}/surveys'.format(self.qualtrics.baseUrl), request_header=headers, payload=data)
+        res = self.qualtrics.transport.post_request(url='{}/surveys'.format(self.qualtrics.baseUrl), request_header=headers, payload=data)
         if res:
             new_survey_id = res.json()['result']['id']
-            self.qualtrics.get_surveys(forceUpdate=True, skipAPICalls=skipAPICalls)
-            if returnNewSurvey:
+            if returnNewSurvey or self.qualtrics.surveys or self.qualtrics.metadataCache:
+                new_survey = None
                 retry_limit = 3
-                while retry_limit > 0:
-                    new_survey = self.qualtrics.get_survey(survey_id=new_survey_id, forceUpdate=True, skipAPICalls=skipAPICalls)
-                    if new_survey:
-                        if activateNow:
-                            new_survey = new_survey.update(isActive=True, skipAPICalls=skipAPICalls)
-                        return new_survey
+                while retry_limit > 0 and not new_survey:
+                    new_survey = self.qualtrics.fetch_survey(survey_id=new_survey_id, skipAPICalls=skipAPICalls)
                     retry_limit -= 1
-                return new_survey
+                _store_changed(self.qualtrics, 'surveys', new_survey, item_id=new_survey_id)
+                if new_survey and activateNow:
+                    new_survey = new_survey.update(isActive=True, returnNewSurvey=returnNewSurvey,
+                                                   skipAPICalls=skipAPICalls)
+                if returnNewSurvey:
+                    return new_survey
             return True
         if returnNewSurvey:
             return None
@@ -1259,22 +3845,24 @@ class Survey:
             data['isActive'] = isActive
         if owner and owner.id:
             data['ownerId'] = owner.id
-        res = put_request('{baseUrl}/surveys/{s_id}'.format(baseUrl=self.qualtrics.baseUrl, s_id=self.id),
+        res = self.qualtrics.transport.put_request('{baseUrl}/surveys/{s_id}'.format(baseUrl=self.qualtrics.baseUrl, s_id=self.id),
                           payload=data)
         if res:
-            self.qualtrics.get_surveys(forceUpdate=True, skipAPICalls=skipAPICalls)
-            if returnNewSurvey:
-                return self.qualtrics.get_survey(survey_id=self.id, skipAPICalls=skipAPICalls)
+            if returnNewSurvey or self.qualtrics.surveys or self.qualtrics.metadataCache:
+                new_survey = self.qualtrics.fetch_survey(survey_id=self.id, skipAPICalls=skipAPICalls)
+                _store_changed(self.qualtrics, 'surveys', new_survey, item_id=self.id)
+                if returnNewSurvey:
+                    return new_survey
             return True
         if returnNewSurvey:
             return None
         return False
 
     def delete(self, skipAPICalls: bool = False):
-        res = delete_request(url=
+        res = self.qualtrics.transport.delete_request(url=
                              '{baseUrl}/survey-definitions/{s_id}'.format(baseUrl=self.qualtrics.baseUrl, s_id=self.id))
         if res:
-            self.qualtrics.get_surveys(forceUpdate=True, skipAPICalls=skipAPICalls)
+            _store_removed(self.qualtrics, 'surveys', self.id)
             return True
         return False
 
@@ -1282,11 +3870,10 @@ class Survey:
               skipAPICalls: bool = False):
         data = {'recipientId': recipient.id,
                 'permissions': permissions.data}
-        res = post_request(
+        res = self.qualtrics.transport.post_request(
             url='{baseUrl}/surveys/{s_id}/permissions/collaborations'.format(baseUrl=self.qualtrics.baseUrl,
                                                                              s_id=self.id), payload=data)
         if res:
-            self.qualtrics.get_surveys(forceUpdate=True, skipAPICalls=skipAPICalls)
             if returnSharedUser:
                 logging.warning("Use the new User for future API calls on this survey")
                 return recipient
@@ -1296,37 +3883,31 @@ class Survey:
         return False
 
     def get_quotas(self, forceUpdate: bool = False, skipAPICalls: bool = False):
-        if forceUpdate or not self.quotas:
-            time.sleep(1)  # have to wait for API server to catch up
-            res = get_request(url='{baseUrl}/surveys/{id}/quotas'.format(baseUrl=self.qualtrics.baseUrl, id=self.id))
+        if forceUpdate or not self._quotas:
+            res = self.qualtrics.transport.get_request(url='{baseUrl}/surveys/{id}/quotas'.format(baseUrl=self.qualtrics.baseUrl, id=self.id))
             if res:
-                quotas = []
+                quotas = IndexedList(id='id', name='name')
                 for quota in res.json()['result']['elements']:
                     quotas.append(Quota(quota))
                 self.quotas = quotas
-        return self.quotas
+        return self._quotas
 
     def get_quota(self, quota_id=None, quota_name=None, forceUpdate: bool = False, skipAPICalls: bool = False):
         if not quota_id and not quota_name:
             return None
         quotas = self.get_quotas(forceUpdate=forceUpdate, skipAPICalls=skipAPICalls)
         if quotas:
-            for quota in quotas:
-                if quota_id and quota_id == quota.id:
-                    return quota
-                if quota_name and quota_name == quota.name:
-                    return quota
+            return quotas.find('id', quota_id) or quotas.find('name', quota_name)
         return None
 
     def get_flow(self, forceUpdate: bool = False, skipAPICalls: bool = False):
-        if forceUpdate or not self.flow:
-            time.sleep(1)  # have to wait for API server to catch up
-            res = get_request(
+        if forceUpdate or not self._flow:
+            res = self.qualtrics.transport.get_request(
                 '{baseUrl}/survey-definitions/{s_id}/flow'.format(baseUrl=self.qualtrics.baseUrl, s_id=self.id))
             if res:
                 self.flow = Flow(data=res.json()['result'], survey=self, qualtrics=self.qualtrics,
                                  skipAPICalls=skipAPICalls)
-        return self.flow
+        return self._flow
 
 
 class Quota:
@@ -1339,68 +3920,100 @@ class Quota:
         self.logicType = data.get('logicType')
 
 
-class Filter:
-    def __init__(self, filter=None, skipAPICalls: bool = False):
-        self.filter = filter
+class _ResponseField:
+    # Response attribute read straight from (and written back to) the response's data dict
+    def __init__(self, column):
+        self.column = column
+
+    def __get__(self, response, owner=None):
+        if response is None:
+            return self
+        return response.data.get(self.column)
+
+    def __set__(self, response, value):
+        response.data[self.column] = value
 
 
 class Response:
-    def __init__(self, data, survey: Survey, qualtrics: Qualtrics, skipAPICalls: bool = False):
+    # a survey can hold millions of these, so no per-instance __dict__; answers and responder are built on first use
+    __slots__ = ('data', 'survey', 'labels', '_answers', '_responder', '_questions', '__weakref__')
+
+    startDate = _ResponseField('StartDate')
+    endDate = _ResponseField('EndDate')
+    status = _ResponseField('Status')
+    ipAddress = _ResponseField('IPAddress')
+    progress = _ResponseField('Progress')
+    duration = _ResponseField('Duration (in seconds)')
+    finished = _ResponseField('Finished')
+    recordedDate = _ResponseField('RecordedDate')
+    id = _ResponseField('ResponseId')
+    externalReference = _ResponseField('ExternalReference')
+    lat = _ResponseField('LocationLatitude')
+    long = _ResponseField('LocationLongitude')
+    distributionChannel = _ResponseField('DistributionChannel')
+    userLang = _ResponseField('UserLanguage')
+
+    def __init__(self, data, survey: Survey, qualtrics: Qualtrics = None, skipAPICalls: bool = False):
         self.data = data
         self.survey = survey
-        self.qualtrics = qualtrics
-        self.startDate = data.get('StartDate')
-        self.endDate = data.get('EndDate')
-        self.status = data.get('Status')
-        self.ipAddress = data.get('IPAddress')
-        self.progress = data.get('Progress')
-        self.duration = data.get('Duration (in seconds)')
-        self.finished = data.get('Finished')
-        self.recordedDate = data.get('RecordedDate')
-        self.id = data.get('ResponseId')
-        responderData = {
-            'FirstName': data.get('RecipientFirstName'),
-            'LastName': data.get('RecipientLastName'),
-            'Email': data.get('RecipientEmail'),
-        }
-        self.responder = Responder(responderData)
-        self.externalReference = data.get('ExternalReference')
-        self.lat = data.get('LocationLatitude')
-        self.long = data.get('LocationLongitude')
-        self.distributionChannel = data.get('DistributionChannel')
-        self.userLang = data.get('UserLanguage')
-        self.questions = []
-        self.answers = {}
-        for k, v in self.data.items():
-            if k.startswith('Q'):
-                self.answers[k] = v
+        self.labels = None
+        self._answers = None
+        self._responder = None
+        self._questions = None
+
+    @property
+    def qualtrics(self):
+        return self.survey.qualtrics
+
+    @property
+    def responder(self):
+        if self._responder is None:
+            self._responder = Responder({
+                'FirstName': self.data.get('RecipientFirstName'),
+                'LastName': self.data.get('RecipientLastName'),
+                'Email': self.data.get('RecipientEmail'),
+            })
+        return self._responder
+
+    @responder.setter
+    def responder(self, responder):
+        self._responder = responder
+
+    @property
+    def answers(self):
+        if self._answers is None:
+            self._answers = {k: v for k, v in self.data.items() if k.startswith('Q')}
+        return self._answers
+
+    @answers.setter
+    def answers(self, answers):
+        self._answers = answers
+
+    @property
+    def questions(self):
+        if self._questions is None:
+            self._questions = []
+        return self._questions
+
+    @questions.setter
+    def questions(self, questions):
+        self._questions = questions
 
     def delete(self, decrementQuotas: str = "true", skipAPICalls: bool = False):
-        res = delete_request(
-            url='{baseUrl}/surveys/{s_id}/responses/{r_id}?decrementQuotas={quota}'.format(
-                baseUrl=self.qualtrics.baseUrl,
-                s_id=self.survey.id,
-                r_id=self.id,
-                quota=decrementQuotas))
-        if res:
-            self.survey.get_responses(re_download=True)
-            return True
-        return False
+        results = self.survey.delete_responses([self.id], decrementQuotas=str(decrementQuotas).lower() == 'true',
+                                               max_concurrency=1)
+        return results[self.id] is True
 
     def update(self,
                data: dict,
                resetRecordedDate: bool = True,
                returnNewResponse: bool = True,
                skipAPICalls: bool = False):
-        payload = {'embeddedData': data,
-                   'resetRecordedDate': resetRecordedDate
-                   }
-        res = put_request('{baseUrl}/responses/{r_id}'.format(baseUrl=self.qualtrics.baseUrl, r_id=self.id),
-                          payload=payload)
-        if res:
-            self.survey.get_responses(re_download=True, skipAPICalls=skipAPICalls)
-            if returnNewResponse:
-                return self.survey.get_response(response_id=self.id, re_download=False)
+        results = self.survey.update_responses({self.id: data}, resetRecordedDate=resetRecordedDate,
+                                               max_concurrency=1)
+        if results[self.id] is True:
+            if returnNewResponse:  # patched in place, no new export needed
+                return self.survey.get_response(response_id=self.id, re_download=False) or self
             return True
         if returnNewResponse:
             return None
@@ -1452,11 +4065,12 @@ class Question:
     """
 
     def delete(self, skipAPICalls: bool = False):
-        res = delete_request(url=
+        res = self.qualtrics.transport.delete_request(url=
         '{baseUrl}/survey-definitions/{s_id}/questions/{q_id}'.format(
             baseUrl=self.qualtrics.baseUrl, s_id=self.survey.id, q_id=self.id))
         if res:
-            self.survey.get_questions(forceUpdate=True)
+            self.survey.questions.discard('id', self.id)
+            _forget_survey_definition(self.qualtrics, self.survey.id)
             return True
         return False
 
@@ -1485,7 +4099,7 @@ class Flow:
         ]:
             if var:
                 data[varname] = var
-        res = put_request(
+        res = self.qualtrics.transport.put_request(
             '{baseUrl}/survey-definitions/{s_id}/flow/{f_id}'.format(baseUrl=self.qualtrics.baseUrl, s_id=self.surveyid,
                                                                      f_id=self.flowId),
             payload=data)
@@ -1513,3 +4127,309 @@ class Responder:
         self.firstName = data.get('FirstName')
         self.lastName = data.get('LastName')
         self.email = data.get('Email')
+
+
+class AsyncQualtrics:
+    def __init__(self, qualtricsUrl: str, qualtricsToken: str, surveyResponseFolder: str = None,
+                 verbose: bool = False, poolSize: int = 10, keepAlive: bool = True, timeout: float = 60,
+                 rateLimiter: RateLimiter = None, maxRetries: int = 5, responseStore: ResponseStore = None):
+        """
+        asyncio client for the Qualtrics API. Returns the same model objects as Qualtrics (built with skipAPICalls).
+        Their own synchronous methods (Survey.update, MailingList.update, ...) go through a regular Transport sharing
+        the same rate limiter, via the synchronous fetch_* methods below. Requires httpx (pip install pyualtrics[async])
+
+        :param qualtricsUrl: Your organizational base URL (likely https://yourorganization.qualtrics.com/API/v3)
+        :param qualtricsToken: Your Qualtrics API key
+        :param surveyResponseFolder: Where survey responses should be downloaded to
+        :param verbose: Log every API request
+        :param poolSize: Maximum number of pooled connections to the Qualtrics API
+        :param keepAlive: Reuse connections between API calls
+        :param timeout: Seconds to wait for the Qualtrics API before giving up on a request
+        :param rateLimiter: RateLimiter shared by every API call made through this instance
+        :param maxRetries: How many times to retry a request rejected with 429 Too Many Requests
+        :param responseStore: Keep downloaded responses in this ResponseStore (Parquet/Feather). Optional
+        """
+        self.baseUrl = qualtricsUrl
+        self.token = qualtricsToken
+        self.header = {'X-API-TOKEN': self.token}
+        self.responseFolder = surveyResponseFolder
+        self.responseStore = responseStore
+        self.metadataCache = None
+        self.rateLimiter = rateLimiter if rateLimiter else RateLimiter()
+        self.asyncTransport = AsyncTransport(token=self.token, poolSize=poolSize, keepAlive=keepAlive,
+                                             timeout=timeout, verbose=verbose, rateLimiter=self.rateLimiter,
+                                             maxRetries=maxRetries)
+        self.transport = Transport(token=self.token, poolSize=poolSize, keepAlive=keepAlive, timeout=timeout,
+                                   verbose=verbose, rateLimiter=self.rateLimiter, maxRetries=maxRetries)
+        self.surveys = IndexedList(id='id', name='name')
+        self.users = IndexedList(id='id', username='username')
+        self.mailing_lists = IndexedList(id='id', name='name')
+        self.libraries = IndexedList(id='id', name='name')
+        self.groups = IndexedList(id='id', name='name')
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        await self.asyncTransport.close()
+        self.transport.close()
+
+    # Synchronous single-object lookups the models call after their own mutations
+    def fetch_survey(self, survey_id: str, skipAPICalls: bool = False):
+        return Qualtrics.fetch_survey(self, survey_id=survey_id, skipAPICalls=skipAPICalls)
+
+    def fetch_user(self, user_id: str, skipAPICalls: bool = False):
+        return Qualtrics.fetch_user(self, user_id=user_id, skipAPICalls=skipAPICalls)
+
+    def fetch_group(self, group_id: str, skipAPICalls: bool = False):
+        return Qualtrics.fetch_group(self, group_id=group_id, skipAPICalls=skipAPICalls)
+
+    def fetch_mailing_list(self, list_id: str, skipAPICalls: bool = False):
+        return Qualtrics.fetch_mailing_list(self, list_id=list_id, skipAPICalls=skipAPICalls)
+
+    async def iter_surveys(self):
+        async for survey in self.asyncTransport.iter_elements(url='{}/surveys'.format(self.baseUrl),
+                                                              offsetPaging=True):
+            yield Survey(data=survey, qualtrics=self, responseFolder=self.responseFolder, skipAPICalls=True)
+
+    async def get_surveys(self, forceUpdate: bool = False):
+        if forceUpdate or not self.surveys:
+            self.surveys = IndexedList([survey async for survey in self.iter_surveys()], id='id', name='name')
+        return self.surveys
+
+    async def get_survey(self, survey_id: str = None, survey_name: str = None, forceUpdate: bool = False):
+        if not survey_id and not survey_name:
+            return None
+        surveys = await self.get_surveys(forceUpdate=forceUpdate)
+        if surveys:
+            return surveys.find('id', survey_id) or surveys.find('name', survey_name)
+        return None
+
+    async def iter_users(self):
+        async for user in self.asyncTransport.iter_elements(url='{}/users'.format(self.baseUrl)):
+            yield User(data=user, qualtrics=self, skipAPICalls=True)
+
+    async def get_users(self, forceUpdate: bool = False):
+        if forceUpdate or not self.users:
+            self.users = IndexedList([user async for user in self.iter_users()], id='id', username='username')
+        return self.users
+
+    async def get_user(self, user_id: str = None, user_username: str = None, forceUpdate: bool = False):
+        if not user_id and not user_username:
+            return None
+        users = await self.get_users(forceUpdate=forceUpdate)
+        if users:
+            return users.find('id', user_id) or users.find('username', user_username)
+        return None
+
+    async def iter_groups(self):
+        async for group in self.asyncTransport.iter_elements(url='{}/groups'.format(self.baseUrl), offsetPaging=True):
+            yield Group(data=group, qualtrics=self, skipAPICalls=True)
+
+    async def get_groups(self, forceUpdate: bool = False):
+        if forceUpdate or not self.groups:
+            self.groups = IndexedList([group async for group in self.iter_groups()], id='id', name='name')
+        return self.groups
+
+    async def iter_mailing_lists(self):
+        async for mailing_list in self.asyncTransport.iter_elements(url='{}/mailinglists'.format(self.baseUrl),
+                                                                    offsetPaging=True):
+            yield MailingList(data=mailing_list, qualtrics=self, skipAPICalls=True)
+
+    async def get_mailing_lists(self, forceUpdate: bool = False):
+        if forceUpdate or not self.mailing_lists:
+            self.mailing_lists = IndexedList([mailing_list async for mailing_list in self.iter_mailing_lists()],
+                                             id='id', name='name')
+        return self.mailing_lists
+
+    async def get_mailing_list(self, list_id: str = None, list_name: str = None, forceUpdate: bool = False):
+        if not list_id and not list_name:
+            return None
+        lists = await self.get_mailing_lists(forceUpdate=forceUpdate)
+        if lists:
+            return lists.find('id', list_id) or lists.find('name', list_name)
+        return None
+
+    async def iter_contacts(self, mailingList: MailingList):
+        url = '{baseUrl}/mailinglists/{list_id}/contacts'.format(baseUrl=self.baseUrl, list_id=mailingList.id)
+        async for contact in self.asyncTransport.iter_elements(url=url):
+            yield Contact(data=contact, mailingList=mailingList, qualtrics=self, skipAPICalls=True)
+
+    async def get_contacts(self, mailingList: MailingList, forceUpdate: bool = False):
+        """
+        Download a mailing list's contacts into MailingList.contacts
+        """
+        if forceUpdate or not mailingList.contacts:
+            mailingList.contacts = IndexedList([contact async for contact in self.iter_contacts(mailingList)],
+                                               id='id', name=('firstName', 'lastName'))
+        return mailingList.contacts
+
+    async def fetch_contact(self, mailingList: MailingList, contact_id: str):
+        res = await self.asyncTransport.get_request(
+            url='{baseUrl}/mailinglists/{list_id}/contacts/{c_id}'.format(baseUrl=self.baseUrl,
+                                                                        list_id=mailingList.id, c_id=contact_id))
+        if res.is_success:
+            return Contact(data=res.json()['result'], mailingList=mailingList, qualtrics=self, skipAPICalls=True)
+        return None
+
+    async def create_contact(self, mailingList: MailingList, entry_data: dict, returnNewContact: bool = True):
+        """
+        Add one contact to a mailing list
+        :param mailingList: List to add the contact to
+        :param entry_data: {'firstName': ..., 'lastName': ..., 'email': ..., 'embeddedData': {...}, ...}
+        :param returnNewContact: Download and return the new Contact rather than True
+        :return: Contact or True, None/False on failure
+        """
+        res = await self.asyncTransport.post_request(
+            url='{baseUrl}/mailinglists/{list_id}/contacts'.format(baseUrl=self.baseUrl, list_id=mailingList.id),
+            payload=entry_data)
+        if res.is_success:
+            new_contact_id = res.json()['result']['id']
+            if returnNewContact:
+                new_contact = await self.fetch_contact(mailingList, contact_id=new_contact_id)
+            else:
+                new_contact = Contact(data=dict(entry_data, id=new_contact_id), mailingList=mailingList,
+                                      qualtrics=self, skipAPICalls=True)
+            if new_contact and mailingList.contacts:
+                mailingList.contacts.upsert(new_contact)
+            if returnNewContact:
+                return new_contact
+            return True
+        if returnNewContact:
+            return None
+        return False
+
+    async def update_contact(self, contact: Contact, entry_data: dict, returnNewContact: bool = True):
+        """
+        Change fields on an existing contact
+        :param contact: Contact to update
+        :param entry_data: Fields to change, same keys as create_contact
+        :param returnNewContact: Download and return the updated Contact rather than True
+        :return: Contact or True, None/False on failure
+        """
+        res = await self.asyncTransport.put_request(
+            url='{baseUrl}/mailinglists/{list_id}/contacts/{c_id}'.format(baseUrl=self.baseUrl,
+                                                                        list_id=contact.mailingList.id,
+                                                                        c_id=contact.id),
+            payload=entry_data)
+        if res.is_success:
+            if returnNewContact or contact.mailingList.contacts:
+                new_contact = await self.fetch_contact(contact.mailingList, contact_id=contact.id)
+                if new_contact and contact.mailingList.contacts:
+                    contact.mailingList.contacts.upsert(new_contact)
+                if returnNewContact:
+                    return new_contact
+            return True
+        if returnNewContact:
+            return None
+        return False
+
+    async def export_survey(self, survey: Survey, fileFormat: str = 'csv', folderName: str = None,
+                            poll_interval: float = 0.5, max_poll_interval: float = 10, timeout: float = None,
+                            on_progress=None, chunk_size: int = 1024 * 1024, **exportOptions):
+        """
+        Export and download one survey's responses
+        :param survey: Survey to export
+        :param fileFormat: Export file format
+        :param folderName: Where to save the file. Defaults to the survey's response folder
+        :param poll_interval: Seconds before the first progress check, backing off up to max_poll_interval
+        :param max_poll_interval: Longest wait between progress checks
+        :param timeout: Raise ExportTimeout if the export isn't ready after this many seconds. Optional
+        :param on_progress: Called with (bytesReceived, totalBytes) while downloading. Optional
+        :param chunk_size: Download buffer size
+        :param exportOptions: Passed to the export request, i.e. start_date, end_date, use_labels, question_ids
+        :return: path to the downloaded file
+        """
+        if folderName:
+            survey.responseFolder = folderName
+        if not survey.responseFolder:
+            raise Exception('No response folder assigned')
+        res = await self.asyncTransport.post_request(url=survey._export_url(),
+                                                     payload=survey._export_payload(fileFormat, **exportOptions))
+        if not res.is_success:
+            raise ExportFailed('export could not be started: {}'.format(res.text))
+        progressId = res.json()['result']['progressId']
+
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        fileId = None
+        for delay in _backoff_delays(initial=poll_interval, maximum=max_poll_interval, jitter=0.2):
+            if deadline is not None:
+                delay = min(delay, max(0.0, deadline - time.monotonic()))
+            await asyncio.sleep(delay)
+            res = await self.asyncTransport.get_request(url=survey._export_url() + progressId)
+            if res.is_success:
+                result = res.json()['result']
+                if result['status'] == 'complete':
+                    fileId = result['fileId']
+                    break
+                if result['status'] == 'failed':
+                    raise ExportFailed('export failed', progressId=progressId)
+            if deadline is not None and time.monotonic() >= deadline:
+                raise ExportTimeout('export not complete after {} seconds'.format(timeout), progressId=progressId)
+
+        os.makedirs(survey.responseFolder, exist_ok=True)
+        tmp = tempfile.NamedTemporaryFile(dir=survey.responseFolder, suffix='.download', delete=False)
+        try:
+            res = await self.asyncTransport.get_request(url=survey._export_file_url(fileId), stream=True)
+            try:
+                if not res.is_success:
+                    raise ExportFailed('export download failed: {}'.format(res.status_code), progressId=progressId)
+                totalBytes = int(res.headers['Content-Length']) if res.headers.get('Content-Length') else None
+                bytesReceived = 0
+                with tmp:
+                    async for chunk in res.aiter_bytes(chunk_size=chunk_size):
+                        await _run_in_thread(tmp.write, chunk)
+                        bytesReceived += len(chunk)
+                        if on_progress:
+                            on_progress(bytesReceived, totalBytes)
+            finally:
+                await res.aclose()
+            responsesFile = await _run_in_thread(survey._extract_export_file, downloadedFile=tmp.name,
+                                                 fileFormat=fileFormat)
+        finally:
+            tmp.close()
+            if os.path.exists(tmp.name):
+                os.remove(tmp.name)
+        survey.responsesFile = responsesFile
+        survey.responses = IndexedList(id='id')
+        survey.responseDataframe = None
+        return responsesFile
+
+    async def get_responses(self, survey: Survey, re_download: bool = False, **exportOptions):
+        """
+        Async version of Survey.get_responses. Exports if needed, then parses the file off the event loop
+        :param survey: Survey whose responses to load
+        :param re_download: Export again even if the survey already has a responses file
+        :param exportOptions: Passed to export_survey
+        :return: [Response, Response, Response, ...]
+        """
+        if re_download or not survey.responsesFile:
+            await self.export_survey(survey, **exportOptions)
+        if not survey.responses:
+            await _run_in_thread(survey._load_responses)
+        return survey.responses
+
+    async def export_responses(self, surveys: list = None, max_concurrency: int = 10, **exportOptions):
+        """
+        Export many surveys at once, at most max_concurrency at a time
+        :param surveys: Surveys to export. Defaults to every survey in AsyncQualtrics.surveys
+        :param max_concurrency: Most exports in flight at once
+        :param exportOptions: Passed to export_survey
+        :return: {survey_id: path to the downloaded file, or the exception that stopped that export}
+        """
+        if surveys is None:
+            surveys = await self.get_surveys()
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def export(survey):
+            async with semaphore:
+                try:
+                    return await self.export_survey(survey, **exportOptions)
+                except Exception as e:
+                    return e
+
+        results = await asyncio.gather(*[export(survey) for survey in surveys])
+        return {survey.id: result for survey, result in zip(surveys, results)}
@@ -18,6 +18,10 @@ setup(
         'requests',
         'pandas',
     ],
+    extras_require={
+        'store': ['pyarrow'],  # ResponseStore
+        'async': ['httpx'],  # AsyncQualtrics
+    },
     classifiers=[
         'Development Status :: 4 - Beta',
         # Chose either "3 - Alpha", "4 - Beta" or "5 - Production/Stable" as the current state of your package
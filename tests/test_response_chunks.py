@@ -0,0 +1,122 @@
+import json
+
+import pandas as pd
+import pytest
+
+from pyualtrics.qualtrics import EqualsFilter, InFilter, RangeFilter, ResponseStore, Survey, _text_mask
+
+pytest.importorskip('pyarrow')
+
+ROWS = [
+    ['2024-01-01 10:00:00', '1', 'R_1', '1', '3', '1'],
+    ['2024-01-01 12:00:00', '0', 'R_2', '2', '', '2'],
+    ['2024-01-02 09:30:00', '1', 'R_3', '1', '5', '1'],
+    ['2024-01-03 18:45:00', '1', 'R_4', '', '3', 'other'],
+]
+COLUMNS = ['RecordedDate', 'Finished', 'ResponseId', 'Q1', 'Q2', 'Q3']
+
+
+class FakeResponse:
+    status_code = 200
+    text = ''
+
+    def __bool__(self):
+        return True
+
+
+class FakeTransport:
+    def put_request(self, url, request_header=None, payload=None):
+        return FakeResponse()
+
+    def delete_request(self, url, request_header=None):
+        return FakeResponse()
+
+
+class FakeQualtrics:
+    baseUrl = 'https://example.qualtrics.com/API/v3'
+
+    def __init__(self, responseStore=None):
+        self.responseStore = responseStore
+        self.users = None
+        self.transport = FakeTransport()
+
+
+def _survey(tmp_path, responseStore=None):
+    path = tmp_path / 'Survey.csv'
+    with open(path, 'w') as f:
+        for _ in range(3):  # the export repeats its header in two more rows
+            f.write(','.join(COLUMNS) + '\n')
+        for row in ROWS:
+            f.write(','.join(row) + '\n')
+    return Survey({'id': 'SV_1', 'name': 'Survey'}, FakeQualtrics(responseStore), str(tmp_path),
+                  responseFile=str(path), skipAPICalls=True)
+
+
+def _json_survey(tmp_path):
+    path = tmp_path / 'Survey.json'
+    records = [{'responseId': row[2], 'values': {'recordedDate': row[0], 'finished': int(row[1]), '_recordId': row[2],
+                                                 **{column: value for column, value in zip(COLUMNS[3:], row[3:])
+                                                    if value}}}
+               for row in ROWS]
+    with open(path, 'w') as f:
+        json.dump({'responses': records}, f)
+    return Survey({'id': 'SV_1', 'name': 'Survey'}, FakeQualtrics(), str(tmp_path), responseFile=str(path),
+                  skipAPICalls=True)
+
+
+@pytest.mark.parametrize('make_survey', [_survey, _json_survey])
+def test_deleted_and_updated_responses_are_written_back(tmp_path, make_survey):
+    survey = make_survey(tmp_path)
+    assert list(survey.responseDataframe['ResponseId']) == ['R_1', 'R_2', 'R_3', 'R_4']
+    survey.delete_responses(['R_2'])
+    survey.update_responses({'R_3': {'Q1': '9', 'Source': 'web'}})
+
+    for frame in [survey.responseDataframe, pd.concat(survey.iter_response_chunks(chunksize=2))]:
+        assert list(frame['ResponseId']) == ['R_1', 'R_3', 'R_4']
+        assert frame.set_index('ResponseId')['Q1'].get('R_3') == 9
+        assert frame.set_index('ResponseId')['Source'].get('R_3') == 'web'
+    survey.responseDataframe = None  # read back from the export file
+    assert list(survey.responseDataframe['ResponseId']) == ['R_1', 'R_3', 'R_4']
+    assert survey.count_answers('Q1').to_dict() == {1: 1, 9: 1}
+
+
+@pytest.mark.parametrize('filter', [
+    InFilter('Q1', ['1']),
+    EqualsFilter('Finished', '1'),
+    InFilter('Q2', ['3', 5]) & ~EqualsFilter('Finished', 0),
+    RangeFilter('RecordedDate', start='2024-01-01 11:00', end='2024-01-03'),
+])
+def test_chunk_filters_match_with_and_without_store(tmp_path, filter):
+    fromCsv = _survey(tmp_path)
+    store = ResponseStore(folder=str(tmp_path / 'store'))
+    fromStore = _survey(tmp_path, responseStore=store)
+    store.write(fromStore)
+    assert store.is_current(fromStore)
+
+    pd.testing.assert_series_equal(fromCsv.count_answers('Q2', filter=filter, chunksize=2),
+                                   fromStore.count_answers('Q2', filter=filter, chunksize=2))
+    pd.testing.assert_series_equal(fromCsv.count_responses_per_day(filter=filter, chunksize=2),
+                                   fromStore.count_responses_per_day(filter=filter, chunksize=2))
+    assert len(fromCsv.filter_responses(filter)) == sum(fromCsv.count_responses_per_day(filter=filter))
+
+
+@pytest.mark.parametrize('chunksize', [1, 2, 10])
+def test_chunks_keep_one_type_per_column(tmp_path, chunksize):
+    survey = _survey(tmp_path)
+    # Q2 is missing only in the first chunks, Q3 only turns out to be text in the last one
+    pd.testing.assert_series_equal(survey.count_answers('Q2', chunksize=chunksize),
+                                   survey.count_answers('Q2', chunksize=10))
+    assert survey.count_answers('Q3', chunksize=chunksize).to_dict() == {'1': 2, '2': 1, 'other': 1}
+    for chunk in survey.iter_response_chunks(chunksize=chunksize, columns=['Q2', 'Q3']):
+        assert chunk['Q2'].dtype == 'float64' and isinstance(chunk['Q3'].dtype, pd.StringDtype)
+
+
+@pytest.mark.parametrize('values', [
+    pd.Series(['3', '', None], dtype=object),
+    pd.Series([3.0, None, None]),
+    pd.Series(['3', None, None], dtype='string'),
+])
+def test_missing_values_match_none_and_empty_on_every_dtype(values):
+    assert list(_text_mask(values, [None])) == [False, True, True]
+    assert list(_text_mask(values, [''])) == [False, True, True]
+    assert list(_text_mask(values, ['3'])) == [True, False, False]